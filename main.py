@@ -195,7 +195,8 @@ class PyPDFToolsV2:
             self.ocr_processor = OCRProcessor(
                 languages=ocr_languages,
                 cache_enabled=self.cache_manager.enabled,
-                log_manager=self.log_manager
+                log_manager=self.log_manager,
+                max_workers=self.max_workers
             )
             
             self.log_manager.info("İşleme motorları başarıyla başlatıldı")
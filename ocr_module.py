@@ -6,36 +6,1366 @@ Gelişmiş OCR işlemleri ve dil yönetimi
 """
 
 import os
+import io
 import cv2
 import numpy as np
 from pathlib import Path
-from typing import List, Dict, Optional, Tuple, Any
+from typing import List, Dict, Optional, Tuple, Any, Iterable, Iterator
 import threading
+import itertools
+import collections
+import concurrent.futures
+from multiprocessing import shared_memory
 import requests
 import subprocess
 import tempfile
 import json
+import hashlib
+import contextlib
+import importlib.util
+import multiprocessing
 
 try:
     import pytesseract
-    from PIL import Image, ImageEnhance, ImageFilter
+    from PIL import Image
     import pdf2image
     DEPENDENCIES_AVAILABLE = True
 except ImportError as e:
     print(f"OCR bağımlılıkları eksik: {e}")
     DEPENDENCIES_AVAILABLE = False
 
+try:
+    import fitz  # PyMuPDF (sayfa sayfa render için, yoksa pdf2image kullanılır)
+    from resources.raster_utils import pixmap_to_array, pixmap_to_image, normalize_pixmap
+    PYMUPDF_AVAILABLE = True
+except ImportError:
+    PYMUPDF_AVAILABLE = False
+
+from resources.raster_utils import classify_pixels, encode_g4_tiff, ccitt_strip, ccitt_image_keys
+
+# Tesseract C API (kalıcı motor, yoksa pytesseract kullanılır); ilk motor oluşturulurken yüklenir,
+# çünkü libgomp OMP_THREAD_LIMIT'i yalnızca kütüphane yüklenirken okur
+TESSEROCR_AVAILABLE = importlib.util.find_spec('tesserocr') is not None
+tesserocr = None
+
+# OSD yazı sistemi -> varsayılan dil eşlemesi
+SCRIPT_LANGUAGES = {
+    'Latin': 'eng',
+    'Arabic': 'ara',
+    'Chinese': 'chi_sim',
+    'Cyrillic': 'rus',
+    'Devanagari': 'hin',
+    'Japanese': 'jpn',
+    'Korean': 'kor'
+}
+
+# Dil algılama: örnek bu çözünürlüğe küçültülür ve ana metin bloğundan kırpılır;
+# kelimelerin bu oranından fazlası Türkçe'ye özgü harf içeriyorsa yalnızca 'tur' kullanılır
+LANGUAGE_SAMPLE_DPI = 150
+LANGUAGE_SAMPLE_MIN_HEIGHT = 400
+TURKISH_CHARS = set('çğıöşüÇĞİÖŞÜ')
+TURKISH_WORD_RATIO = 0.05
+
+# Tesseract veri alanları (pytesseract Output.DICT ile aynı düzen)
+OCR_DATA_FIELDS = ['level', 'page_num', 'block_num', 'par_num', 'line_num', 'word_num',
+                   'left', 'top', 'width', 'height', 'conf', 'text']
+
+class _PytesseractEngine:
+    """pytesseract tabanlı motor (her çağrı yeni bir tesseract süreci başlatır)"""
+    
+    name = 'pytesseract'
+    
+    def __init__(self, language: str, psm: int = 3, oem: int = 3):
+        self.language = language
+        self.config = f'--psm {psm} --oem {oem}'
+    
+    def image_to_string(self, image: Image.Image) -> str:
+        return pytesseract.image_to_string(image, lang=self.language, config=self.config)
+    
+    def image_to_data(self, image: Image.Image) -> Dict[str, List]:
+        return pytesseract.image_to_data(
+            image,
+            lang=self.language,
+            config=self.config,
+            output_type=pytesseract.Output.DICT
+        )
+    
+    def recognize(self, image: Image.Image, hocr: bool = False, alto: bool = False) -> Dict[str, Any]:
+        """Metin ve kelime kutuları tek çalıştırmadan; hOCR/ALTO yalnızca istenirse ayrı çalıştırmayla"""
+        result = _build_ocr_result(self.image_to_data(image))
+        
+        # pytesseract'ın genel API'si birden fazla çıktı biçimini tek çalıştırmada üretmez
+        if hocr:
+            result['hocr'] = pytesseract.image_to_pdf_or_hocr(
+                image, lang=self.language, config=self.config, extension='hocr'
+            ).decode('utf-8')
+        if alto:
+            result['alto'] = pytesseract.image_to_alto_xml(
+                image, lang=self.language, config=self.config
+            ).decode('utf-8')
+        return result
+    
+    def detect_script(self, image: Image.Image) -> Optional[str]:
+        """OSD ile yazı sistemini algıla (motor 'osd' diliyle oluşturulmalı)"""
+        osd_result = pytesseract.image_to_osd(image, lang=self.language)
+        script_line = [line for line in osd_result.split('\n') if 'Script:' in line]
+        return script_line[0].split('Script:')[1].strip() if script_line else None
+    
+    def close(self):
+        pass
+
+class _TesserocrEngine:
+    """Tesseract C API motoru, dil modelleri bir kez yüklenir ve çağrılar arasında tekrar kullanılır"""
+    
+    name = 'tesserocr'
+    
+    def __init__(self, language: str, psm: int = 3, oem: int = 3):
+        self.language = language
+        _load_tesserocr()
+        self.api = tesserocr.PyTessBaseAPI(lang=language, psm=psm, oem=oem)
+    
+    def _set_image(self, image: Image.Image):
+        self.api.SetImage(image)
+        
+        # Bilinen çözünürlük Tesseract'a bildirilir (tahmin yerine)
+        dpi = _image_dpi(image)
+        if dpi:
+            self.api.SetSourceResolution(int(dpi))
+    
+    def image_to_string(self, image: Image.Image) -> str:
+        self._set_image(image)
+        return self.api.GetUTF8Text()
+    
+    def image_to_data(self, image: Image.Image) -> Dict[str, List]:
+        self._set_image(image)
+        self.api.Recognize()
+        return self._word_data()
+    
+    def recognize(self, image: Image.Image, hocr: bool = False, alto: bool = False) -> Dict[str, Any]:
+        """Tek tanıma geçişinden metin, kelime kutuları ve isteğe bağlı hOCR/ALTO"""
+        self._set_image(image)
+        self.api.Recognize()
+        
+        result = _build_ocr_result(self._word_data(), text=self.api.GetUTF8Text())
+        if hocr:
+            result['hocr'] = self.api.GetHOCRText(0)
+        if alto:
+            result['alto'] = self.api.GetAltoText(0)
+        return result
+    
+    def detect_script(self, image: Image.Image) -> Optional[str]:
+        """OSD ile yazı sistemini algıla (motor 'osd' diliyle, PSM 0 ile oluşturulmalı)"""
+        self._set_image(image)
+        osd = self.api.DetectOrientationScript()
+        return osd.get('script_name') if osd else None
+    
+    def _word_data(self) -> Dict[str, List]:
+        """Son tanıma sonucundaki kelimeleri Output.DICT düzeninde topla"""
+        data = {field: [] for field in OCR_DATA_FIELDS}
+        iterator = self.api.GetIterator()
+        if iterator is None:
+            return data
+        
+        level = tesserocr.RIL.WORD
+        block_num = par_num = line_num = word_num = 0
+        
+        for word in tesserocr.iterate_level(iterator, level):
+            if word.IsAtBeginningOf(tesserocr.RIL.BLOCK):
+                block_num += 1
+                par_num = line_num = 0
+            if word.IsAtBeginningOf(tesserocr.RIL.PARA):
+                par_num += 1
+                line_num = 0
+            if word.IsAtBeginningOf(tesserocr.RIL.TEXTLINE):
+                line_num += 1
+                word_num = 0
+            
+            text = word.GetUTF8Text(level)
+            box = word.BoundingBox(level)
+            if text is None or box is None:
+                continue
+            
+            word_num += 1
+            left, top, right, bottom = box
+            data['level'].append(5)
+            data['page_num'].append(1)
+            data['block_num'].append(block_num)
+            data['par_num'].append(par_num)
+            data['line_num'].append(line_num)
+            data['word_num'].append(word_num)
+            data['left'].append(left)
+            data['top'].append(top)
+            data['width'].append(right - left)
+            data['height'].append(bottom - top)
+            data['conf'].append(word.Confidence(level))
+            data['text'].append(text)
+        
+        return data
+    
+    def close(self):
+        self.api.End()
+
+def _build_ocr_result(data: Dict[str, List], text: str = None) -> Dict[str, Any]:
+    """Output.DICT verisinden metin, kelime listesi ve ortalama güven skoru oluştur"""
+    words = []
+    for i, word_text in enumerate(data.get('text', [])):
+        conf = float(data['conf'][i])
+        if conf < 0 or not str(word_text).strip():
+            continue
+        
+        words.append({
+            'text': str(word_text),
+            'confidence': conf,
+            'left': int(data['left'][i]),
+            'top': int(data['top'][i]),
+            'width': int(data['width'][i]),
+            'height': int(data['height'][i]),
+            'block_num': int(data['block_num'][i]),
+            'par_num': int(data['par_num'][i]),
+            'line_num': int(data['line_num'][i])
+        })
+    
+    return {
+        'text': _words_to_text(words) if text is None else text,
+        'words': words,
+        'confidence': _mean_confidence(words)
+    }
+
+def _words_to_text(words: List[Dict]) -> str:
+    """Kelime listesinden düz metin (Tesseract çıktısıyla aynı düzen: satırlar alt alta, paragraflar boş satırla ayrılır)"""
+    lines = []
+    previous_line = previous_par = None
+    for word in words:
+        par_key = (word['block_num'], word['par_num'])
+        line_key = par_key + (word['line_num'],)
+        if line_key != previous_line:
+            if previous_par is not None and par_key != previous_par:
+                lines.append('')
+            lines.append(word['text'])
+        else:
+            lines[-1] += ' ' + word['text']
+        previous_line, previous_par = line_key, par_key
+    return '\n'.join(lines) + '\n' if lines else ''
+
+def _mean_confidence(words: List[Dict]) -> float:
+    """Kelimelerin ortalama güven skoru (geçersiz skorlar hariç)"""
+    confidences = [word['confidence'] for word in words if word['confidence'] > 0]
+    return sum(confidences) / len(confidences) if confidences else 0
+
+# Motorlar iş parçacığı başına tutulur (Tesseract API'si thread-safe değildir);
+# süreç havuzundaki her işçi kendi motorlarını sayfalar ve belgeler boyunca kullanır
+_engine_local = threading.local()
+
+def get_tesseract_engine(language: str, config: Dict = None):
+    """Dil ve PSM/OEM ayarı için kalıcı Tesseract motorunu al"""
+    config = config or {}
+    psm = int(config.get('psm', 3))
+    oem = int(config.get('oem', 3))
+    
+    engines = getattr(_engine_local, 'engines', None)
+    if engines is None:
+        engines = _engine_local.engines = {}
+    
+    key = (language, psm, oem)
+    engine = engines.get(key)
+    if engine is None:
+        if TESSEROCR_AVAILABLE:
+            try:
+                engine = _TesserocrEngine(language, psm, oem)
+            except Exception:
+                engine = None
+        if engine is None:
+            engine = _PytesseractEngine(language, psm, oem)
+        engines[key] = engine
+    
+    return engine
+
+def close_tesseract_engines():
+    """Bu iş parçacığına ait motorları kapat"""
+    engines = getattr(_engine_local, 'engines', None) or {}
+    for engine in engines.values():
+        try:
+            engine.close()
+        except Exception:
+            pass
+    engines.clear()
+
+def get_engine_name(language: str = None, config: Dict = None) -> str:
+    """
+    Kullanılan OCR motorunun adını al
+    Dil verilirse bu iş parçacığında o dil için oluşturulan (tesserocr açılamadıysa yedek) motorun adı;
+    verilmezse bu iş parçacığında oluşturulmuş motorun, hiç yoksa tercih edilecek motorun adı
+    """
+    if language:
+        return get_tesseract_engine(language, config).name
+    
+    engines = getattr(_engine_local, 'engines', None) or {}
+    for engine in engines.values():
+        return engine.name
+    return _TesserocrEngine.name if TESSEROCR_AVAILABLE else _PytesseractEngine.name
+
+# Sayfa işlem türleri (process_pdf sayfa planı)
+PAGE_OCR = 'ocr'        # render edilip OCR uygulanır
+PAGE_NATIVE = 'native'  # tek tam sayfa tarama, gömülü görüntü doğrudan OCR'a verilir
+PAGE_TEXT = 'text'      # kullanılabilir metin katmanı var, olduğu gibi kopyalanır
+PAGE_BLANK = 'blank'    # boş / neredeyse boş sayfa, OCR uygulanmaz
+
+# Boş sayfa tespiti: küçük gri önizleme, kenar payı (tarayıcı gölgeleri) hariç tutulur;
+# arka plandan bu kadar koyu pikseller mürekkep sayılır
+BLANK_SAMPLE_DPI = 24
+BLANK_MARGIN_RATIO = 0.04
+BLANK_INK_DELTA = 64
+
+# Eğim düzeltme: açı tahmini bu boyuta küçültülmüş kopyada yapılır,
+# bu değerin altındaki açılar düzeltilmez
+DESKEW_SAMPLE_SIZE = 1000
+DESKEW_MIN_ANGLE = 0.3
+
+# Metin bölgesi tespiti: düzen analizi bu genişliğe küçültülmüş kopyada yapılır;
+# bölgeler sayfanın bu oranından fazlasını kaplıyorsa tam sayfa OCR'ı tercih edilir
+REGION_SAMPLE_WIDTH = 1000
+REGION_MAX_COVERAGE = 0.8
+REGION_MAX_FILL = 0.55
+REGION_MIN_AREA_RATIO = 0.0002
+
+# Sayfa işçileri süreç havuzunda çalıştığı için ön işleme ve OCR adımları
+# modül seviyesinde tutulur (pickle edilebilir olmaları gerekir)
+
+def _image_dpi(image: Image.Image) -> Optional[float]:
+    """Görüntünün gerçek DPI değerini al (dosyada kayıtlı değilse None)"""
+    dpi = image.info.get('dpi')
+    if isinstance(dpi, (tuple, list)):
+        dpi = dpi[0] if dpi else None
+    
+    try:
+        dpi = float(dpi)
+    except (TypeError, ValueError):
+        return None
+    
+    # JFIF en-boy oranı (1, 1) gibi anlamsız değerler DPI sayılmaz
+    return dpi if dpi >= 10 else None
+
+def _resample_scale(source_dpi: Optional[float], config: Dict) -> float:
+    """Çözünürlük politikası: yalnızca gerçek DPI'ı hedefin altında olan rasterlar büyütülür"""
+    target_dpi = config.get('dpi', 300)
+    if not source_dpi or source_dpi >= target_dpi:
+        return 1.0
+    return target_dpi / source_dpi
+
+def _to_gray_array(image: Image.Image) -> np.ndarray:
+    """PIL görüntüsünü yazılabilir tek kanallı uint8 diziye çevir"""
+    if image.mode == 'L':
+        return np.array(image)
+    if image.mode == 'RGB':
+        return cv2.cvtColor(np.asarray(image), cv2.COLOR_RGB2GRAY)
+    return np.array(image.convert('L'))
+
+def preprocess_array(gray: np.ndarray, config: Dict, scale_factor: float = 1.0) -> Tuple[np.ndarray, float]:
+    """Gri tonlamalı uint8 dizi üzerinde ön işleme, (dizi, eğim açısı) döndürür"""
+    # Kontrast, gürültü azaltma ve ikilileştirme aynı tampon üzerinde yerinde
+    # uygulanır; yalnızca büyütme ve döndürme yeni tampon üretir
+    if scale_factor > 1.0:
+        gray = cv2.resize(gray, None, fx=scale_factor, fy=scale_factor,
+                          interpolation=cv2.INTER_LANCZOS4)
+    
+    if config.get('contrast_enhancement', True):
+        # Kontrast artırma (ortalama griden uzaklaştırma, PIL ImageEnhance.Contrast ile aynı)
+        mean = float(gray.mean())
+        cv2.addWeighted(gray, 1.5, gray, 0.0, -0.5 * mean, dst=gray)
+    
+    if config.get('noise_removal', True):
+        # Gürültü azaltma
+        cv2.medianBlur(gray, 3, dst=gray)
+    
+    angle = 0.0
+    if config.get('deskew', True):
+        # Eğim düzeltme
+        angle = estimate_skew_angle(gray)
+        if abs(angle) > DESKEW_MIN_ANGLE:
+            gray = _rotate_array(gray, angle)
+        else:
+            angle = 0.0
+    
+    if config.get('binarize', False):
+        # Adaptif ikilileştirme (düzensiz aydınlatmalı taramalar için)
+        block_size = int(config.get('binarize_block_size', 31)) | 1
+        cv2.adaptiveThreshold(gray, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
+                              cv2.THRESH_BINARY, block_size, 15, dst=gray)
+    
+    return gray, angle
+
+def estimate_skew_angle(gray: np.ndarray, max_angle: float = 5.0) -> float:
+    """Küçültülmüş kopya üzerinde projeksiyon profili ile eğim açısını tahmin et"""
+    height, width = gray.shape[:2]
+    scale = min(1.0, DESKEW_SAMPLE_SIZE / max(height, width))
+    if scale < 1.0:
+        sample = cv2.resize(gray, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+    else:
+        sample = gray
+    
+    # Mürekkep maskesi (metin = 1)
+    _, ink = cv2.threshold(sample, 0, 1, cv2.THRESH_BINARY_INV | cv2.THRESH_OTSU)
+    if cv2.countNonZero(ink) < 50:
+        return 0.0
+    
+    sample_height, sample_width = ink.shape
+    center = (sample_width / 2, sample_height / 2)
+    
+    def profile_score(angle: float) -> float:
+        # Satırlar yatay olduğunda satır toplamları en keskin (varyans en yüksek) olur
+        matrix = cv2.getRotationMatrix2D(center, angle, 1.0)
+        rotated = cv2.warpAffine(ink, matrix, (sample_width, sample_height),
+                                 flags=cv2.INTER_NEAREST, borderValue=0)
+        return float(np.var(rotated.sum(axis=1, dtype=np.int32)))
+    
+    # Kaba arama (1°), ardından ince arama (0.1°)
+    best = max(np.arange(-max_angle, max_angle + 0.5, 1.0), key=profile_score)
+    best = max(np.arange(best - 1.0, best + 1.05, 0.1), key=profile_score)
+    return round(float(best), 2) + 0.0
+
+def _rotate_array(gray: np.ndarray, angle: float) -> np.ndarray:
+    """Diziyi boyutunu koruyarak döndür (kelime koordinatları sayfa ile hizalı kalır)"""
+    height, width = gray.shape[:2]
+    matrix = cv2.getRotationMatrix2D((width / 2, height / 2), angle, 1.0)
+    return cv2.warpAffine(gray, matrix, (width, height), flags=cv2.INTER_LINEAR,
+                          borderMode=cv2.BORDER_CONSTANT, borderValue=255)
+
+def detect_text_regions(gray: np.ndarray) -> List[Tuple[int, int, int, int]]:
+    """Küçültülmüş kopyada morfolojik işlemler ve bağlı bileşenlerle metin bloklarını bul (x, y, w, h)"""
+    height, width = gray.shape[:2]
+    scale = min(1.0, REGION_SAMPLE_WIDTH / width)
+    sample = cv2.resize(gray, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA) if scale < 1.0 else gray
+    
+    _, ink = cv2.threshold(sample, 0, 255, cv2.THRESH_BINARY_INV | cv2.THRESH_OTSU)
+    
+    # Tablo çizgileri ve çerçeveler bloklar birleşmeden önce çıkarılır
+    sample_height, sample_width = ink.shape
+    horizontal = cv2.morphologyEx(ink, cv2.MORPH_OPEN, cv2.getStructuringElement(
+        cv2.MORPH_RECT, (max(1, sample_width // 8), 1)))
+    vertical = cv2.morphologyEx(ink, cv2.MORPH_OPEN, cv2.getStructuringElement(
+        cv2.MORPH_RECT, (1, max(1, sample_height // 8))))
+    text_ink = cv2.subtract(ink, cv2.bitwise_or(horizontal, vertical))
+    
+    # Harfler satırlara, satırlar bloklara birleşir (sütun boşlukları korunur)
+    merged = cv2.dilate(text_ink, cv2.getStructuringElement(cv2.MORPH_RECT, (15, 11)))
+    count, _, stats, _ = cv2.connectedComponentsWithStats(merged, connectivity=8)
+    
+    min_area = sample_height * sample_width * REGION_MIN_AREA_RATIO
+    padding = 4
+    regions = []
+    
+    for x, y, w, h, _ in stats[1:count]:
+        if w * h < min_area or h < 4:
+            continue
+        
+        # Dolu bloklar (fotoğraf, logo, koyu zemin) metin değildir
+        fill = np.count_nonzero(text_ink[y:y + h, x:x + w]) / float(w * h)
+        if fill > REGION_MAX_FILL:
+            continue
+        
+        x0 = max(0, int((x - padding) / scale))
+        y0 = max(0, int((y - padding) / scale))
+        x1 = min(width, int((x + w + padding) / scale))
+        y1 = min(height, int((y + h + padding) / scale))
+        regions.append((x0, y0, x1 - x0, y1 - y0))
+    
+    # Okuma sırası: yukarıdan aşağıya, soldan sağa
+    regions.sort(key=lambda region: (region[1], region[0]))
+    return regions
+
+# Bölge OCR'ı için süreç başına iş parçacığı havuzları (motorlar iş parçacığı başına tutulur);
+# havuzlar boyutlarına göre saklanır, başka bir işin kullandığı havuz değiştirilip kapatılmaz
+_region_pools = {}
+_region_pool_lock = threading.Lock()
+
+def _get_region_pool(workers: int) -> concurrent.futures.ThreadPoolExecutor:
+    with _region_pool_lock:
+        pool = _region_pools.get(workers)
+        if pool is None:
+            pool = _region_pools[workers] = concurrent.futures.ThreadPoolExecutor(max_workers=workers)
+        return pool
+
+def _shutdown_region_pool():
+    with _region_pool_lock:
+        for pool in _region_pools.values():
+            pool.shutdown(wait=True)
+        _region_pools.clear()
+
+def _recognize_page(image: Image.Image, language: str, config: Dict) -> Dict[str, Any]:
+    """Sayfayı tanı; seçici yeniden OCR açıksa düşük güvenli satırları ağır ön işlemeyle yeniden tanı"""
+    result = _recognize_layout(image, language, config)
+    
+    if config.get('selective_reocr', False):
+        result = _refine_low_confidence(image, result, language, config)
+    
+    return result
+
+def _first_pass_config(config: Dict) -> Dict:
+    """Seçici yeniden OCR'da ilk geçiş hafif ön işlemeyle yapılır (gürültü azaltma ve ikilileştirme yok)"""
+    if not config.get('selective_reocr', False):
+        return config
+    return dict(config, noise_removal=False, binarize=False)
+
+def _heavy_preprocess_array(gray: np.ndarray, upscale: float) -> np.ndarray:
+    """Düşük güvenli satırlar için ağır ön işleme: büyütme, gürültü azaltma ve adaptif ikilileştirme"""
+    if upscale > 1.0:
+        gray = cv2.resize(gray, None, fx=upscale, fy=upscale, interpolation=cv2.INTER_CUBIC)
+    gray = cv2.fastNlMeansDenoising(gray, None, h=15, templateWindowSize=7, searchWindowSize=21)
+    cv2.adaptiveThreshold(gray, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
+                          cv2.THRESH_BINARY, 31, 15, dst=gray)
+    return gray
+
+def _refine_low_confidence(image: Image.Image, result: Dict[str, Any], language: str,
+                           config: Dict) -> Dict[str, Any]:
+    """Güveni eşiğin altındaki kelimeleri içeren satırları yeniden tanı, daha iyi hipotezi koru"""
+    threshold = config.get('reocr_confidence', 60)
+    upscale = float(config.get('reocr_upscale', 2.0))
+    
+    # Satırlar (blok, paragraf, satır) anahtarıyla gruplanır
+    lines = collections.OrderedDict()
+    for word in result['words']:
+        lines.setdefault((word['block_num'], word['par_num'], word['line_num']), []).append(word)
+    
+    weak_lines = [key for key, words in lines.items()
+                  if any(word['confidence'] < threshold for word in words)]
+    if not weak_lines:
+        return result
+    
+    gray = np.asarray(image.convert('L'))
+    height, width = gray.shape
+    line_config = dict(config, psm=7)  # tek metin satırı
+    
+    def reocr_line(key):
+        words = lines[key]
+        padding = max(4, max(word['height'] for word in words) // 3)
+        x0 = max(0, min(word['left'] for word in words) - padding)
+        y0 = max(0, min(word['top'] for word in words) - padding)
+        x1 = min(width, max(word['left'] + word['width'] for word in words) + padding)
+        y1 = min(height, max(word['top'] + word['height'] for word in words) + padding)
+        
+        crop = Image.fromarray(_heavy_preprocess_array(gray[y0:y1, x0:x1], upscale))
+        dpi = _image_dpi(image)
+        if dpi:
+            crop.info['dpi'] = (dpi * upscale, dpi * upscale)
+        
+        candidate = get_tesseract_engine(language, line_config).recognize(crop)['words']
+        
+        # Kutular sayfa koordinatlarına geri ölçeklenir, satır numaraları korunur
+        return [dict(
+            word,
+            left=x0 + int(word['left'] / upscale),
+            top=y0 + int(word['top'] / upscale),
+            width=int(word['width'] / upscale),
+            height=int(word['height'] / upscale),
+            block_num=key[0],
+            par_num=key[1],
+            line_num=key[2]
+        ) for word in candidate]
+    
+    workers = max(1, int(config.get('region_workers', 1)))
+    if workers > 1 and len(weak_lines) > 1:
+        candidates = list(_get_region_pool(workers).map(reocr_line, weak_lines))
+    else:
+        candidates = [reocr_line(key) for key in weak_lines]
+    
+    # Yeni satır ortalama güvende daha iyiyse eski satırın yerini alır
+    replaced = 0
+    for key, candidate in zip(weak_lines, candidates):
+        if candidate and _mean_confidence(candidate) > _mean_confidence(lines[key]):
+            lines[key] = candidate
+            replaced += 1
+    
+    if not replaced:
+        return result
+    
+    words = [word for line_words in lines.values() for word in line_words]
+    return dict(result, text=_words_to_text(words), words=words, confidence=_mean_confidence(words),
+                reocr_lines=replaced)
+
+def _recognize_layout(image: Image.Image, language: str, config: Dict) -> Dict[str, Any]:
+    """Sayfayı tanı; metin bölgesi modu açıksa yalnızca metin bloklarını tam çözünürlükte OCR'la"""
+    if not config.get('text_regions', False):
+        return get_tesseract_engine(language, config).recognize(image)
+    
+    regions = detect_text_regions(np.asarray(image.convert('L')))
+    covered = sum(w * h for _, _, w, h in regions)
+    if not regions or covered > image.width * image.height * REGION_MAX_COVERAGE:
+        return get_tesseract_engine(language, config).recognize(image)
+    
+    # Bloklar tek tip metin bloğu olarak tanınır (sayfa düzeni analizi gerekmez)
+    region_config = dict(config, psm=config.get('region_psm', 6))
+    
+    def recognize_region(region):
+        x, y, w, h = region
+        return get_tesseract_engine(language, region_config).recognize(image.crop((x, y, x + w, y + h)))
+    
+    workers = max(1, int(config.get('region_workers', 1)))
+    if workers > 1 and len(regions) > 1:
+        region_results = list(_get_region_pool(workers).map(recognize_region, regions))
+    else:
+        region_results = [recognize_region(region) for region in regions]
+    
+    # Kelime kutuları sayfa koordinatlarına taşınır, blok numaraları sayfa genelinde tekil tutulur
+    words = []
+    texts = []
+    block_offset = 0
+    for (x, y, _, _), region_result in zip(regions, region_results):
+        for word in region_result['words']:
+            words.append(dict(
+                word,
+                left=word['left'] + x,
+                top=word['top'] + y,
+                block_num=word['block_num'] + block_offset
+            ))
+        block_offset += max((word['block_num'] for word in region_result['words']), default=0)
+        
+        if region_result['text'].strip():
+            texts.append(region_result['text'].strip())
+    
+    return {
+        'text': '\n\n'.join(texts) + '\n' if texts else '',
+        'words': words,
+        'confidence': _mean_confidence(words)
+    }
+
+def _language_sample(image: Image.Image) -> Image.Image:
+    """Dil algılama için düşük çözünürlüklü, ana metin bloğunu içeren küçük bir örnek kırp"""
+    source_dpi = _image_dpi(image) or 300
+    scale = min(1.0, LANGUAGE_SAMPLE_DPI / source_dpi)
+    
+    gray = _to_gray_array(image)
+    if scale < 1.0:
+        gray = cv2.resize(gray, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+    
+    regions = detect_text_regions(gray)
+    if regions:
+        # En büyük blok, OSD için yeterli satır olacak şekilde dikeyde genişletilir
+        x, y, w, h = max(regions, key=lambda region: region[2] * region[3])
+        extra = max(0, LANGUAGE_SAMPLE_MIN_HEIGHT - h) // 2
+        y0 = max(0, y - extra)
+        y1 = min(gray.shape[0], y + h + extra)
+        gray = gray[y0:y1, x:x + w]
+    
+    sample = Image.fromarray(np.ascontiguousarray(gray))
+    sample.info['dpi'] = (source_dpi * scale, source_dpi * scale)
+    return sample
+
+def _file_fingerprint(path) -> str:
+    """Dosyanın boyutu, başı ve sonundan (PDF'te /ID dahil) hızlı içerik parmak izi"""
+    digest = hashlib.blake2b(digest_size=16)
+    size = os.path.getsize(path)
+    digest.update(str(size).encode('ascii'))
+    
+    with open(path, 'rb') as f:
+        digest.update(f.read(65536))
+        if size > 65536:
+            f.seek(max(65536, size - 65536))
+            digest.update(f.read())
+    
+    return digest.hexdigest()
+
+def _preprocess_image(image: Image.Image, config: Dict, source_dpi: Optional[float] = None) -> Image.Image:
+    """Görüntü ön işleme (hata durumunda istisna fırlatır)"""
+    # source_dpi verilmezse dosyada kayıtlı DPI kullanılır; render edilen sayfalar
+    # hedef DPI'da üretildiği için hiçbir zaman yeniden örneklenmez
+    if source_dpi is None:
+        source_dpi = _image_dpi(image)
+    
+    # Çözünürlük artırma yalnızca DPI'ı bilinen ve hedefin altında kalan rasterlar için
+    scale_factor = _resample_scale(source_dpi, config)
+    gray, angle = preprocess_array(_to_gray_array(image), config, scale_factor)
+    processed_image = Image.fromarray(gray)
+    
+    # Eğim açısı, kelime kutularının özgün görüntüye geri eşlenmesi için saklanır
+    processed_image.info['deskew_angle'] = angle
+    
+    # Gerçek çözünürlük Tesseract'a kadar taşınır
+    if source_dpi:
+        effective_dpi = round(source_dpi * scale_factor)
+        processed_image.info['dpi'] = (effective_dpi, effective_dpi)
+    
+    return processed_image
+
+def _deskew_image(image: Image.Image) -> Tuple[Image.Image, float]:
+    """Görüntü eğim düzeltme, (görüntü, açı) döndürür"""
+    gray = _to_gray_array(image)
+    angle = estimate_skew_angle(gray)
+    
+    if abs(angle) <= DESKEW_MIN_ANGLE:
+        return image, 0.0
+    
+    rotated = Image.fromarray(_rotate_array(gray, angle))
+    rotated.info = dict(image.info)
+    return rotated, angle
+
+def _image_coverage(page) -> float:
+    """Sayfa alanının görüntülerle kaplanan oranı (0-1)"""
+    page_area = abs(page.rect)
+    if not page_area:
+        return 0.0
+    
+    covered = 0.0
+    for info in page.get_image_info():
+        bbox = fitz.Rect(info['bbox']) & page.rect
+        if not bbox.is_empty:
+            covered += abs(bbox)
+    
+    return min(1.0, covered / page_area)
+
+def _page_has_usable_text(page, min_chars: int = 20) -> bool:
+    """Sayfada OCR gerektirmeyen, kullanılabilir bir metin katmanı var mı"""
+    chars = [char for char in page.get_text('text') if not char.isspace()]
+    if len(chars) < min_chars:
+        return False
+    
+    # ToUnicode eşlemesi olmayan yazı tiplerinden çıkan bozuk metin kullanılamaz
+    unreadable = sum(1 for char in chars if char == '\ufffd' or not char.isprintable())
+    if unreadable > len(chars) * 0.1:
+        return False
+    
+    # Tam sayfa tarama üzerinde yalnızca damga/sayfa numarası gibi az metin varsa OCR gerekir
+    if _image_coverage(page) >= 0.9 and len(chars) < min_chars * 4:
+        return False
+    
+    return True
+
+def is_blank_array(gray: np.ndarray, max_ink_ratio: float = 0.0005, max_std: float = 12.0) -> bool:
+    """Küçültülmüş gri görüntüde mürekkep oranı ve varyansa bakarak boş sayfa kararı ver"""
+    if gray.size == 0:
+        return True
+    
+    # Arka plan parlaklığı medyandan; kâğıt rengi ve pozlama farkları tolere edilir
+    background = np.median(gray)
+    ink_pixels = np.count_nonzero(gray < background - BLANK_INK_DELTA)
+    if ink_pixels > gray.size * max_ink_ratio:
+        return False
+    
+    # Açık tonlu içerik (soluk fotoğraf, silik kurşun kalem) mürekkep eşiğine takılmaz
+    return float(gray.std()) <= max_std
+
+def _page_is_blank(page, config: Dict) -> bool:
+    """Sayfanın boş olup olmadığını render etmeden ya da küçük bir önizlemeyle belirle"""
+    # Hiç içerik yoksa önizleme gerekmez
+    if not page.get_text('text').strip() and not page.get_images() and not page.get_drawings():
+        return True
+    
+    margin_x = page.rect.width * BLANK_MARGIN_RATIO
+    margin_y = page.rect.height * BLANK_MARGIN_RATIO
+    clip = page.rect + (margin_x, margin_y, -margin_x, -margin_y)
+    
+    pix = page.get_pixmap(dpi=BLANK_SAMPLE_DPI, colorspace=fitz.csGRAY, clip=clip, alpha=False)
+    gray = pixmap_to_array(pix)
+    
+    return is_blank_array(
+        gray,
+        config.get('blank_ink_ratio', 0.0005),
+        config.get('blank_max_std', 12.0)
+    )
+
+def _single_image_placement(page) -> Optional[Tuple[int, Any]]:
+    """Sayfa yalnızca tek bir tam sayfa taramadan oluşuyorsa (xref, bbox) döndür"""
+    if page.rotation:
+        return None
+    
+    infos = page.get_image_info(xrefs=True)
+    if len(infos) != 1 or not infos[0].get('xref'):
+        return None
+    
+    # Görüntü sayfayı kaplamalı ve döndürülmeden/aynalanmadan yerleştirilmiş olmalı
+    info = infos[0]
+    bbox = fitz.Rect(info['bbox'])
+    a, b, c, d, _, _ = info['transform']
+    if abs(bbox & page.rect) < abs(page.rect) * 0.9:
+        return None
+    if a <= 0 or d <= 0 or abs(b) > 1e-3 or abs(c) > 1e-3:
+        return None
+    
+    # Vektör çizimler render edilmeden OCR girdisine giremez
+    if page.get_drawings():
+        return None
+    
+    return info['xref'], bbox
+
+def _remove_text_layer(page):
+    """Sayfadaki metni kaldır; görüntüler ve çizimler olduğu gibi kalır"""
+    page.add_redact_annot(page.rect, fill=False)
+    page.apply_redactions(images=fitz.PDF_REDACT_IMAGE_NONE)
+
+def _extract_native_pixmap(doc, xref: int, bbox):
+    """Gömülü görüntüyü kendi çözünürlüğünde, render etmeden tek seferde çöz"""
+    pix = normalize_pixmap(fitz.Pixmap(doc, xref))
+    
+    # Sayfadaki yerleşimden gerçek çözünürlük
+    effective_dpi = round(pix.width / (bbox.width / 72))
+    pix.set_dpi(effective_dpi, effective_dpi)
+    return pix
+
+def _page_image(page) -> Image.Image:
+    """Render edilen sayfayı (Pixmap ya da PIL görüntüsü) DPI bilgisiyle PIL görüntüsüne çevir"""
+    if isinstance(page, Image.Image):
+        return page
+    
+    image = pixmap_to_image(page)
+    image.info['dpi'] = (page.xres, page.yres)
+    return image
+
+# Toplu görüntü OCR'ında tamamlanan görüntülerin kaydı (devam ettirme için)
+BATCH_MANIFEST_NAME = 'ocr_manifest.jsonl'
+
+# OCR sonuç önbelleği: varsayılan konum ve boyut sınırı
+OCR_CACHE_DIR = Path.home() / ".cache" / "pypdf_tools_v2" / "ocr"
+OCR_CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+# Tanıma sonucunu etkileyen ayarlar (önbellek anahtarına girer)
+OCR_CACHE_CONFIG_KEYS = (
+    'auto_detect', 'preprocessing', 'deskew', 'noise_removal', 'contrast_enhancement',
+    'binarize', 'dpi', 'psm', 'oem', 'hocr', 'alto', 'text_regions', 'region_psm',
+    'selective_reocr', 'reocr_confidence', 'reocr_upscale'
+)
+
+class OCRCache:
+    """
+    Sayfa pikselleri, dil ve motor ayarlarıyla adreslenen disk üzeri OCR sonuç önbelleği
+    Boyut sınırı aşıldığında en uzun süredir kullanılmayan kayıtlar silinir
+    """
+    
+    def __init__(self, directory: Path = None, max_bytes: int = OCR_CACHE_MAX_BYTES):
+        self.directory = Path(directory or OCR_CACHE_DIR)
+        self.max_bytes = max_bytes
+        self.directory.mkdir(parents=True, exist_ok=True)
+    
+    @staticmethod
+    def make_key(image: Image.Image, language: str, config: Dict, kind: str = 'page') -> str:
+        """Görüntü içeriği ve tanıma ayarlarından önbellek anahtarı üret"""
+        digest = hashlib.blake2b(digest_size=20)
+        
+        settings = {key: config.get(key) for key in OCR_CACHE_CONFIG_KEYS}
+        settings.update({
+            'kind': kind,
+            'language': language,
+            # Farklı motorların sonuçları aynı kaydı paylaşmaz (tesserocr açılamazsa yedek motor kullanılır)
+            'engine': get_engine_name(language, config),
+            'source_dpi': _image_dpi(image),
+            'mode': image.mode,
+            'size': image.size
+        })
+        digest.update(json.dumps(settings, sort_keys=True).encode('utf-8'))
+        digest.update(image.tobytes())
+        
+        return digest.hexdigest()
+    
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.json"
+    
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Önbellekteki sonucu oku (yoksa None)"""
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+            
+            # Erişim zamanı LRU sıralaması için güncellenir
+            os.utime(path)
+            return entry
+        
+        except (OSError, ValueError):
+            return None
+    
+    def put(self, key: str, entry: Dict[str, Any]):
+        """Sonucu önbelleğe yaz (atomik: yarım kalmış kayıt okunmaz)"""
+        path = self._path(key)
+        try:
+            path.parent.mkdir(exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(entry, f, ensure_ascii=False)
+            os.replace(temp_path, path)
+        except OSError:
+            pass
+    
+    def _entries(self) -> List[Tuple[float, int, Path]]:
+        entries = []
+        for path in self.directory.glob('*/*.json'):
+            try:
+                stat = path.stat()
+                entries.append((stat.st_mtime, stat.st_size, path))
+            except OSError:
+                continue
+        return entries
+    
+    def size(self) -> int:
+        """Önbelleğin diskteki toplam boyutu"""
+        return sum(size for _, size, _ in self._entries())
+    
+    def prune(self) -> int:
+        """Boyut sınırı aşılmışsa en eski kayıtları sil, silinen kayıt sayısını döndür"""
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                path.unlink()
+                total -= size
+                removed += 1
+            except OSError:
+                continue
+        
+        return removed
+    
+    def clear(self):
+        """Tüm önbellek kayıtlarını sil"""
+        for _, _, path in self._entries():
+            try:
+                path.unlink()
+            except OSError:
+                continue
+
+# Paylaşımlı sayfa tamponları 1 MB katlarında ayrılır (benzer boyutlu sayfalar aynı bloğu kullanır)
+SHARED_BUFFER_ALIGN = 1024 * 1024
+
+class _SharedPageBuffers:
+    """
+    Render edilen sayfaları işçi süreçlere aktarmak için yeniden kullanılan paylaşımlı bellek blokları
+    İşçilere yalnızca küçük bir tanımlayıcı gönderilir, pikseller pickle edilmez
+    """
+    
+    def __init__(self):
+        self._free = []
+        self._blocks = []
+        self._lock = threading.Lock()
+    
+    def put(self, page) -> Tuple[Dict[str, Any], shared_memory.SharedMemory]:
+        """Sayfa piksellerini (gri / RGB Pixmap ya da PIL görüntüsü) boş bir bloğa tek kopyayla yaz"""
+        if isinstance(page, Image.Image):
+            if page.mode not in ('L', 'RGB'):
+                page = page.convert('RGB')
+            pixels = np.asarray(page)
+            info = {key: page.info[key] for key in ('dpi',) if key in page.info}
+        else:
+            # Pixmap örnekleri kopyasız görünümle okunur, ara PIL görüntüsü / bayt dizisi oluşmaz
+            pixels = pixmap_to_array(page)
+            info = {'dpi': (page.xres, page.yres)}
+        
+        block = self._acquire(pixels.nbytes)
+        target = np.ndarray(pixels.shape, dtype=np.uint8, buffer=block.buf)
+        target[...] = pixels
+        # Blok kapatılabilsin diye tampon görünümü hemen bırakılır
+        del target
+        
+        height, width = pixels.shape[:2]
+        descriptor = {
+            'name': block.name,
+            'mode': 'L' if pixels.ndim == 2 else 'RGB',
+            'size': (width, height),
+            'info': info
+        }
+        return descriptor, block
+    
+    def _acquire(self, nbytes: int) -> shared_memory.SharedMemory:
+        with self._lock:
+            for block in self._free:
+                if block.size >= nbytes:
+                    self._free.remove(block)
+                    return block
+            
+            # Yeterince büyük boş blok yoksa küçük bir boş blok büyütülerek yeniden oluşturulur
+            if self._free:
+                self._discard(self._free.pop(0))
+            
+            size = -(-nbytes // SHARED_BUFFER_ALIGN) * SHARED_BUFFER_ALIGN
+            block = shared_memory.SharedMemory(create=True, size=size)
+            self._blocks.append(block)
+            return block
+    
+    def release(self, block: shared_memory.SharedMemory):
+        """Bloğu yeniden kullanılmak üzere havuza geri ver"""
+        with self._lock:
+            self._free.append(block)
+    
+    def _discard(self, block: shared_memory.SharedMemory):
+        self._blocks.remove(block)
+        block.close()
+        block.unlink()
+    
+    def close(self):
+        """Tüm blokları serbest bırak"""
+        with self._lock:
+            for block in list(self._blocks):
+                self._discard(block)
+            self._free.clear()
+
+def _page_from_shared(descriptor: Dict[str, Any]) -> Image.Image:
+    """Paylaşımlı bellek tanımlayıcısından sayfa görüntüsünü oluştur (işçi tarafı)"""
+    try:
+        # Python 3.13+: işçi bloğu izlemez, sahibi ana süreçtir
+        block = shared_memory.SharedMemory(name=descriptor['name'], track=False)
+    except TypeError:
+        block = shared_memory.SharedMemory(name=descriptor['name'])
+    
+    try:
+        width, height = descriptor['size']
+        nbytes = width * height * (1 if descriptor['mode'] == 'L' else 3)
+        image = Image.frombytes(descriptor['mode'], (width, height), block.buf[:nbytes])
+    finally:
+        block.close()
+    
+    image.info.update(descriptor['info'])
+    return image
+
+# Tesseract'ın OpenMP iş parçacıkları LSTM tanımada sınırlı hız kazandırır;
+# tek süreçte bile bu sayının üstü çekirdek harcar, paralel süreçlerde 1 kullanılır
+MAX_OMP_THREADS = 4
+
+def available_cores() -> int:
+    """Bu sürecin kullanabileceği çekirdek sayısı (CPU affinity / konteyner sınırları dahil)"""
+    try:
+        return len(os.sched_getaffinity(0)) or 1
+    except AttributeError:
+        return os.cpu_count() or 1
+
+def plan_resources(jobs: int, max_workers: int, intra_page: bool = False, cores: int = None) -> Dict[str, int]:
+    """
+    Çekirdek sayısı ve iş karışımına göre süreç sayısını ve süreç içi iş parçacıklarını belirle
+    Havuz boyutu ve işçi iş parçacıkları işten bağımsızdır (havuz belgeler arasında paylaşılır);
+    iş başına paralellik yalnızca 'processes' (aynı anda gönderilen iş sınırı) ile ayarlanır
+    """
+    cores = cores or available_cores()
+    
+    pool_processes = max(1, min(max_workers, cores))
+    processes = max(1, min(pool_processes, jobs))
+    
+    if processes > 1:
+        # Havuz işçisi başına düşen çekirdekler; Tesseract tek iş parçacıklı kalır
+        threads = max(1, cores // pool_processes)
+        omp_threads = 1
+    else:
+        # Tek süreçte iş ana süreçte çalışır, tüm çekirdekler kullanılabilir
+        threads = cores
+        omp_threads = 1 if intra_page else min(threads, MAX_OMP_THREADS)
+    
+    # Bölge/satır OCR'ı kendi iş parçacıklarında paralel
+    region_workers = threads if intra_page else 1
+    
+    return {
+        'cores': cores,
+        'jobs': jobs,
+        'processes': processes,
+        'pool_processes': pool_processes,
+        'omp_threads': omp_threads,
+        'cv_threads': threads,
+        'region_workers': region_workers
+    }
+
+def _apply_thread_limits(omp_threads: int, cv_threads: int):
+    """Tesseract (OpenMP) ve OpenCV iş parçacığı sınırlarını bu süreç için uygula"""
+    # pytesseract her çağrıda yeni süreç başlattığı için ortam değişkeni hemen etkilidir;
+    # tesserocr'da yalnızca kütüphane henüz yüklenmemişse etkilidir (bkz. _load_tesserocr)
+    os.environ['OMP_THREAD_LIMIT'] = str(omp_threads)
+    cv2.setNumThreads(cv_threads)
+
+@contextlib.contextmanager
+def _environment(**values: str):
+    """Ortam değişkenlerini geçici olarak ayarla, çıkışta önceki değerleri geri yükle"""
+    previous = {key: os.environ.get(key) for key in values}
+    os.environ.update(values)
+    try:
+        yield
+    finally:
+        for key, value in previous.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+
+@contextlib.contextmanager
+def _thread_limits(omp_threads: int, cv_threads: int):
+    """İş parçacığı sınırlarını ana süreçte yalnızca iş süresince uygula (arayüz sürecinin ayarları korunur)"""
+    previous_cv = cv2.getNumThreads()
+    with _environment(OMP_THREAD_LIMIT=str(omp_threads)):
+        cv2.setNumThreads(cv_threads)
+        try:
+            yield
+        finally:
+            cv2.setNumThreads(previous_cv)
+
+def _load_tesserocr():
+    """tesserocr'ı ilk kullanımda yükle; OpenMP sınırı yoksa tek süreç üst sınırı uygulanır"""
+    global tesserocr
+    if tesserocr is None:
+        # libgomp sınırı yükleme anında okur; sonradan değiştirmek etkisizdir
+        limit = os.environ.get('OMP_THREAD_LIMIT') or str(min(available_cores(), MAX_OMP_THREADS))
+        with _environment(OMP_THREAD_LIMIT=limit):
+            import tesserocr as module
+        tesserocr = module
+    return tesserocr
+
+def _init_ocr_worker(tesseract_cmd: str, omp_threads: int = 1, cv_threads: int = 1):
+    """
+    İşçi süreci başlat (spawn ile başlayan süreçler Tesseract yolunu miras almaz)
+    Sınırlar tesserocr yüklenmeden önce uygulanır; yükleme ilk motor oluşturulurken yapılır
+    """
+    if DEPENDENCIES_AVAILABLE and tesseract_cmd:
+        pytesseract.pytesseract.tesseract_cmd = tesseract_cmd
+    
+    _apply_thread_limits(omp_threads, cv_threads)
+
+def _ocr_page_worker(page_index: int, page_image: Image.Image, language: str, config: Dict,
+                     encode_output: bool = False, cache: Optional[OCRCache] = None) -> Dict[str, Any]:
+    """Tek sayfayı ön işle ve OCR uygula; metin, kelime kutuları ve (istenirse) kodlanmış sayfa görüntüsü döndürür"""
+    if isinstance(page_image, dict):
+        page_image = _page_from_shared(page_image)
+    
+    result = {
+        'index': page_index,
+        'text': '',
+        'words': [],
+        'confidence': 0,
+        'angle': 0.0,
+        'ocr_size': page_image.size,
+        'image': None,
+        'cache_hit': False,
+        'error': None
+    }
+    
+    # Önbellek Tesseract'tan (ve ön işlemeden) önce denenir
+    cache_key = OCRCache.make_key(page_image, language, config) if cache else None
+    cached = cache.get(cache_key) if cache else None
+    
+    if cached:
+        result.update(cached)
+        result['ocr_size'] = tuple(cached['ocr_size'])
+        result['cache_hit'] = True
+    else:
+        try:
+            if config.get('preprocessing', True):
+                try:
+                    # Render edilen sayfalar hedef DPI'da, gömülü taramalar kendi DPI'ları ile gelir
+                    processed_image = _preprocess_image(page_image, _first_pass_config(config))
+                except Exception:
+                    processed_image = page_image
+            else:
+                processed_image = page_image
+            
+            ocr_result = _recognize_page(processed_image, language, config)
+            entry = {
+                'text': ocr_result['text'],
+                'words': ocr_result['words'],
+                'confidence': ocr_result['confidence'],
+                'angle': processed_image.info.get('deskew_angle', 0.0),
+                'ocr_size': processed_image.size
+            }
+            result.update(entry)
+            
+            if cache:
+                cache.put(cache_key, entry)
+        
+        except Exception as e:
+            result['error'] = str(e)
+    
+    # Çıktı görüntüsü işçide kodlanır; ana sürece ham pikseller yerine sıkıştırılmış veri döner
+    if encode_output:
+        result['image'] = _encode_page_image(page_image, config)
+    
+    return result
+
+def _recognize_image(image: Image.Image, language: str, config: Dict) -> Dict[str, Any]:
+    """Görüntüyü ön işle ve tanı; sonucu önbellek kaydı düzeninde döndür"""
+    if config.get('preprocessing', True):
+        try:
+            processed_image = _preprocess_image(image, _first_pass_config(config))
+        except Exception:
+            processed_image = image
+    else:
+        processed_image = image
+    
+    if config.get('hocr', False) or config.get('alto', False):
+        # hOCR/ALTO tek tanıma geçişinden üretilir (kelime kutularıyla tutarlı kalması için)
+        ocr_result = get_tesseract_engine(language, config).recognize(
+            processed_image,
+            hocr=config.get('hocr', False),
+            alto=config.get('alto', False)
+        )
+    else:
+        # OCR uygula (metin, güven skorları ve kutular tek çağrıda)
+        ocr_result = _recognize_page(processed_image, language, config)
+    
+    return dict(ocr_result, language_used=language)
+
+def _ocr_image_worker(image_path: str, output_dir: str, language: str, config: Dict,
+                      cache: Optional[OCRCache] = None) -> Dict[str, Any]:
+    """Tek görüntü dosyasını OCR'la ve metnini hemen diske yaz; yalnızca özet bilgi döndür"""
+    result = {'image_path': image_path, 'success': False, 'cache_hit': False}
+    
+    try:
+        with Image.open(image_path) as image:
+            image.load()
+            
+            cache_key = OCRCache.make_key(image, language, config, kind='image') if cache else None
+            entry = cache.get(cache_key) if cache else None
+            
+            if entry:
+                result['cache_hit'] = True
+            else:
+                entry = _recognize_image(image, language, config)
+                if cache:
+                    cache.put(cache_key, entry)
+        
+        text = entry['text']
+        text_file = Path(output_dir) / f"{Path(image_path).stem}.txt"
+        with open(text_file, 'w', encoding='utf-8') as f:
+            f.write(text)
+        
+        result.update({
+            'success': True,
+            'text_file': str(text_file),
+            'language_used': entry['language_used'],
+            'confidence': entry['confidence'],
+            'word_count': len(text.split()),
+            'character_count': len(text)
+        })
+    
+    except Exception as e:
+        result['error'] = str(e)
+    
+    return result
+
+def _encode_page_image(image: Image.Image, config: Dict) -> Dict[str, Any]:
+    """Sayfa görüntüsünü çıktı için sıkıştır: bitonal metin -> CCITT G4, diğerleri -> JPEG"""
+    dpi = round(_image_dpi(image) or config.get('dpi', 300))
+    if image.mode not in ('L', 'RGB'):
+        image = image.convert('RGB')
+    # compress_pdf ile aynı sınıflandırıcı: sayfadaki küçük gri fotoğraf eşiklenip kaybolmaz
+    kind = classify_pixels(np.asarray(image))
+    color = kind == 'color'
+    gray = None if color else _to_gray_array(image)
+    buffer = io.BytesIO()
+    
+    if kind == 'bitonal':
+        _, bitonal = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY | cv2.THRESH_OTSU)
+        buffer.write(encode_g4_tiff(bitonal > 0, dpi))
+        image_format = 'tiff'
+    else:
+        jpeg_source = image if color else Image.fromarray(gray)
+        jpeg_source.save(buffer, format='JPEG', quality=config.get('jpeg_quality', 75),
+                         optimize=True, dpi=(dpi, dpi))
+        image_format = 'jpeg'
+    
+    return {
+        'format': image_format,
+        'data': buffer.getvalue(),
+        'width': image.width,
+        'height': image.height,
+        'dpi': dpi
+    }
+
+def _insert_ccitt_image(doc, page, rect, tiff_data: bytes):
+    """Tek şeritli G4 TIFF verisini yeniden kodlamadan CCITTFaxDecode görüntüsü olarak ekle"""
+    strip = ccitt_strip(tiff_data)
+    if strip is None:
+        # Çok şeritli dosya: MuPDF çözüp yeniden sıkıştırır
+        page.insert_image(rect, stream=tiff_data, keep_proportion=False)
+        return
+    
+    data, black_is_1 = strip
+    width, height = Image.open(io.BytesIO(tiff_data)).size
+    
+    xref = doc.get_new_xref()
+    doc.update_object(xref, "<<>>")
+    doc.update_stream(xref, data, compress=False)
+    keys = dict(Type='/XObject', Subtype='/Image', **ccitt_image_keys(width, height, black_is_1))
+    for key, value in keys.items():
+        doc.xref_set_key(xref, key, value)
+    
+    page.insert_image(rect, xref=xref, keep_proportion=False)
+
+def _word_boxes(words: List[Dict], ocr_size: Tuple[int, int], angle: float,
+                target_rect: Tuple[float, float, float, float]) -> Iterator[Tuple[str, float, float, float, float]]:
+    """OCR kelime kutularını hedef dikdörtgene (x0, y0, x1, y1; üstten aşağı) taşı: (metin, sol, taban, genişlik, yükseklik)"""
+    image_width, image_height = ocr_size
+    x0, y0, x1, y1 = target_rect
+    scale_x = (x1 - x0) / image_width
+    scale_y = (y1 - y0) / image_height
+    
+    # Kelime kutuları eğimi düzeltilmiş görüntüde; özgün görüntüye geri döndürülür
+    inverse = cv2.getRotationMatrix2D((image_width / 2, image_height / 2), -angle, 1.0) if angle else None
+    
+    for word in words:
+        center_x = word['left'] + word['width'] / 2
+        center_y = word['top'] + word['height'] / 2
+        if inverse is not None:
+            center_x, center_y = (
+                inverse[0, 0] * center_x + inverse[0, 1] * center_y + inverse[0, 2],
+                inverse[1, 0] * center_x + inverse[1, 1] * center_y + inverse[1, 2]
+            )
+        
+        width = word['width'] * scale_x
+        height = word['height'] * scale_y
+        left = x0 + center_x * scale_x - width / 2
+        baseline = y0 + center_y * scale_y + height / 2
+        yield word['text'], left, baseline, width, height
+
+def _insert_text_layer(page, words: List[Dict], ocr_size: Tuple[int, int], angle: float,
+                       target_rect, fonts: Dict[str, Any]):
+    """OCR kelimelerini görünmez metin olarak, kutularına oturacak şekilde sayfaya yerleştir"""
+    if not words:
+        return
+    
+    writer = fitz.TextWriter(page.rect)
+    for text, left, baseline, width, height in _word_boxes(words, ocr_size, angle, tuple(target_rect)):
+        # Latin dışı karakterler için yedek yazı tipi
+        font = fonts['latin']
+        if any(not font.has_glyph(ord(char)) for char in text):
+            if 'fallback' not in fonts:
+                fonts['fallback'] = fitz.Font('cjk')
+            font = fonts['fallback']
+        
+        # Yazı boyutu kelime genişliğine göre seçilir (arama vurgusu kutuyla örtüşür)
+        unit_length = font.text_length(text, fontsize=1)
+        if unit_length <= 0 or width <= 0:
+            continue
+        fontsize = max(1.0, min(width / unit_length, height * 1.5))
+        
+        writer.append((left, baseline - height * 0.2), text, font=font, fontsize=fontsize)
+    
+    writer.write_text(page, render_mode=3)
+
 class OCRProcessor:
     """
     Gelişmiş OCR işlemci sınıfı
     Çoklu dil desteği ve otomatik dil algılama
     """
     
-    def __init__(self, languages: List[str] = None, cache_enabled: bool = False, log_manager=None):
+    def __init__(self, languages: List[str] = None, cache_enabled: bool = False, log_manager=None,
+                 max_workers: int = None, cache_dir: str = None,
+                 cache_max_bytes: int = OCR_CACHE_MAX_BYTES):
         self.cache_enabled = cache_enabled
         self.log_manager = log_manager
+        self.max_workers = max_workers or os.cpu_count() or 1
         self.processing_lock = threading.Lock()
         
+        # OCR sonuç önbelleği (yalnızca kullanıcı onayıyla diske yazılır)
+        self.ocr_cache = None
+        self.cache_stats = {'hits': 0, 'misses': 0}
+        
+        # Belge parmak izi -> algılanan dil
+        self._language_cache = {}
+        if cache_enabled:
+            try:
+                self.ocr_cache = OCRCache(cache_dir, cache_max_bytes)
+            except OSError as e:
+                self.log(f"OCR önbelleği oluşturulamadı: {e}", "warning")
+        
+        # Sayfa işçi havuzu (ilk kullanımda oluşturulur, belgeler arasında paylaşılır)
+        self._page_pool = None
+        self._page_buffers = None
+        self._pool_lock = threading.Lock()
+        
+        # Son işin kaynak planı (süreç / iş parçacığı dağılımı)
+        self.resource_plan = None
+        
         # Varsayılan diller
         self.default_languages = languages or ['eng', 'tur']
         self.available_languages = []
@@ -48,6 +1378,19 @@ class OCRProcessor:
             'deskew': True,
             'noise_removal': True,
             'contrast_enhancement': True,
+            'binarize': False,
+            'ocr_mode': 'force',  # 'hybrid': metin katmanı olan sayfaları atla
+            'native_images': True,  # tam sayfa taramaları render etmeden kullan
+            'jpeg_quality': 75,  # fotoğraf/gri sayfalar için çıktı JPEG kalitesi
+            'blank_detection': True,  # boş sayfaları OCR'a sokmadan atla
+            'blank_ink_ratio': 0.0005,  # bu orandan az mürekkepli sayfa boş sayılır
+            'blank_max_std': 12.0,  # boş sayfanın izin verilen en yüksek parlaklık sapması
+            'drop_blank_pages': False,  # boş sayfaları çıktıdan çıkar
+            'text_regions': False,  # yalnızca tespit edilen metin bloklarını OCR'la
+            'region_psm': 6,  # metin blokları için PSM (tek tip metin bloğu)
+            'selective_reocr': False,  # hafif ilk geçiş, düşük güvenli satırlar ağır ön işlemeyle yeniden
+            'reocr_confidence': 60,  # bu güvenin altındaki kelimelerin satırları yeniden tanınır
+            'reocr_upscale': 2.0,  # yeniden tanımada satır görüntüsü büyütme oranı
             'psm': 3,  # Page segmentation mode
             'oem': 3   # OCR Engine Mode
         }
@@ -306,6 +1649,91 @@ class OCRProcessor:
             lang_file = tessdata_dir / f"{language_code}.traineddata"
             lang_file.write_bytes(response.content)
             
+            # Yüklü dilleri yeniden tespit et
+            self.detect_installed_languages()
+            
+            self.log(f"Dil paketi başarıyla kuruldu: {language_code}", "info")
+            return True
+            
+        except Exception as e:
+            self.log(f"Windows dil paketi kurulum hatası: {e}", "error")
+            return False
+    
+    def _install_language_linux(self, language_code: str) -> bool:
+        """Linux için dil paketi kur"""
+        try:
+            # Paket yöneticisi ile kur
+            commands = [
+                f"sudo apt-get install -y tesseract-ocr-{language_code}",
+                f"sudo yum install -y tesseract-langpack-{language_code}",
+                f"sudo pacman -S tesseract-data-{language_code}"
+            ]
+            
+            for cmd in commands:
+                try:
+                    result = subprocess.run(cmd.split(), capture_output=True, text=True)
+                    if result.returncode == 0:
+                        self.detect_installed_languages()
+                        return True
+                except:
+                    continue
+            
+            # Manuel indirme
+            return self._download_language_data(language_code)
+            
+        except Exception as e:
+            self.log(f"Linux dil paketi kurulum hatası: {e}", "error")
+            return False
+    
+    def _install_language_macos(self, language_code: str) -> bool:
+        """macOS için dil paketi kur"""
+        try:
+            # Homebrew ile kur
+            cmd = f"brew install tesseract-lang"
+            result = subprocess.run(cmd.split(), capture_output=True, text=True)
+            
+            if result.returncode == 0:
+                self.detect_installed_languages()
+                return True
+            
+            # Manuel indirme
+            return self._download_language_data(language_code)
+            
+        except Exception as e:
+            self.log(f"macOS dil paketi kurulum hatası: {e}", "error")
+            return False
+    
+    def _download_language_data(self, language_code: str) -> bool:
+        """Dil verisini manuel indir"""
+        try:
+            url = f"https://github.com/tesseract-ocr/tessdata/raw/main/{language_code}.traineddata"
+            
+            # Sistem tessdata dizinini bul
+            possible_dirs = [
+                '/usr/share/tesseract-ocr/4.00/tessdata',
+                '/usr/share/tesseract-ocr/tessdata',
+                '/usr/local/share/tessdata',
+                '/opt/homebrew/share/tessdata'
+            ]
+            
+            tessdata_dir = None
+            for dir_path in possible_dirs:
+                if Path(dir_path).exists():
+                    tessdata_dir = Path(dir_path)
+                    break
+            
+            if not tessdata_dir:
+                self.log("Tessdata dizini bulunamadı", "error")
+                return False
+            
+            # İndir
+            response = requests.get(url, timeout=30)
+            response.raise_for_status()
+            
+            # Kaydet
+            lang_file = tessdata_dir / f"{language_code}.traineddata"
+            lang_file.write_bytes(response.content)
+            
             self.detect_installed_languages()
             return True
             
@@ -313,44 +1741,86 @@ class OCRProcessor:
             self.log(f"Manuel dil indirme hatası: {e}", "error")
             return False
     
+    def detect_script(self, image: Image.Image) -> Optional[str]:
+        """Yazı sistemini algıla (yalnızca OSD, metin tanıma yapmaz)"""
+        try:
+            # OSD (Orientation and Script Detection) kalıcı motorla; yalnızca osd modeli yüklenir
+            return get_tesseract_engine('osd', {'psm': 0}).detect_script(image)
+            
+        except Exception as e:
+            self.log(f"Yazı sistemi algılama hatası: {e}", "warning")
+        
+        return None
+    
     def auto_detect_language(self, image: Image.Image) -> str:
-        """Otomatik dil algılama"""
+        """Otomatik dil algılama (küçültülmüş örnek üzerinde, en küçük dil birleşimi seçilir)"""
         try:
-            # OSD (Orientation and Script Detection) kullan
-            osd_result = pytesseract.image_to_osd(image)
+            sample = _language_sample(image)
             
-            # Script bilgisini çıkar
-            script_line = [line for line in osd_result.split('\n') if 'Script:' in line]
-            if script_line:
-                script = script_line[0].split('Script:')[1].strip()
-                
+            # OSD az karakterli örneklerde başarısız olabilir; Latin yazı varsayılır
+            script = self.detect_script(sample) or 'Latin'
+            
+            if script == 'Latin':
+                detected_lang = self._choose_latin_languages(sample)
+            else:
                 # Script'e göre dil öner
-                script_to_lang = {
-                    'Latin': 'eng',
-                    'Arabic': 'ara',
-                    'Chinese': 'chi_sim',
-                    'Cyrillic': 'rus',
-                    'Devanagari': 'hin',
-                    'Japanese': 'jpn',
-                    'Korean': 'kor'
-                }
-                
-                detected_lang = script_to_lang.get(script, 'eng')
-                
-                # Türkçe karakterler varsa Türkçe öner
-                sample_text = pytesseract.image_to_string(image, config='--psm 3')
-                turkish_chars = set('çğıöşüÇĞIİÖŞÜ')
-                if any(char in sample_text for char in turkish_chars):
-                    detected_lang = 'tur'
-                
-                self.log(f"Algılanan dil: {detected_lang} (Script: {script})", "info")
-                return detected_lang
+                detected_lang = SCRIPT_LANGUAGES.get(script, 'eng')
+            
+            self.log(f"Algılanan dil: {detected_lang} (Script: {script})", "info")
+            return detected_lang
             
         except Exception as e:
             self.log(f"Dil algılama hatası: {e}", "warning")
         
-        # Varsayılan dil
-        return 'tur' if 'tur' in self.installed_languages else 'eng'
+        # Varsayılan dil
+        return 'tur' if 'tur' in self.installed_languages else 'eng'
+    
+    def _choose_latin_languages(self, sample: Image.Image) -> str:
+        """Latin yazılı örnek için gereken en küçük dil birleşimini seç (eng, tur veya eng+tur)"""
+        has_eng = 'eng' in self.installed_languages
+        has_tur = 'tur' in self.installed_languages
+        if not (has_eng and has_tur):
+            return 'tur' if has_tur else 'eng'
+        
+        words = get_tesseract_engine('eng+tur', {'psm': 3}).recognize(sample)['words']
+        turkish_words = sum(1 for word in words if TURKISH_CHARS & set(word['text']))
+        
+        # Türkçe harf yoksa İngilizce modeli yeter; az sayıda varsa (özel isimler vb.) ikisi birden
+        if turkish_words == 0:
+            return 'eng'
+        if turkish_words >= len(words) * TURKISH_WORD_RATIO:
+            return 'tur'
+        return 'eng+tur'
+    
+    def detect_document_language(self, image: Image.Image, fingerprint: str = None) -> str:
+        """Belge ya da toplu iş başına bir kez dil algıla (sonuç belge parmak izine göre saklanır)"""
+        cache_key = None
+        if fingerprint:
+            if fingerprint in self._language_cache:
+                return self._language_cache[fingerprint]
+            
+            if self.ocr_cache:
+                cache_key = hashlib.blake2b(
+                    f"language:{fingerprint}:{','.join(sorted(self.installed_languages))}".encode('utf-8'),
+                    digest_size=20
+                ).hexdigest()
+                cached = self.ocr_cache.get(cache_key)
+                if cached:
+                    self._language_cache[fingerprint] = cached['language']
+                    return cached['language']
+        
+        language = self.auto_detect_language(image)
+        
+        if fingerprint:
+            self._language_cache[fingerprint] = language
+            if cache_key:
+                self.ocr_cache.put(cache_key, {'language': language})
+        
+        return language
+    
+    def _languages_installed(self, language: str) -> bool:
+        """'eng+tur' gibi birleşimlerdeki tüm dillerin kurulu olup olmadığını kontrol et"""
+        return all(part in self.installed_languages for part in language.split('+'))
     
     def preprocess_image(self, image: Image.Image, config: Dict = None) -> Image.Image:
         """Görüntü ön işleme"""
@@ -358,39 +1828,7 @@ class OCRProcessor:
             config = self.default_config
         
         try:
-            processed_image = image.copy()
-            
-            # Gri tonlamaya çevir
-            if processed_image.mode != 'L':
-                processed_image = processed_image.convert('L')
-            
-            if config.get('contrast_enhancement', True):
-                # Kontrast artırma
-                enhancer = ImageEnhance.Contrast(processed_image)
-                processed_image = enhancer.enhance(1.5)
-            
-            if config.get('noise_removal', True):
-                # Gürültü azaltma
-                processed_image = processed_image.filter(ImageFilter.MedianFilter(size=3))
-            
-            if config.get('deskew', True):
-                # Eğim düzeltme
-                processed_image = self._deskew_image(processed_image)
-            
-            # Çözünürlük artırma
-            target_dpi = config.get('dpi', 300)
-            current_dpi = processed_image.info.get('dpi', (72, 72))
-            
-            if isinstance(current_dpi, tuple):
-                current_dpi = current_dpi[0]
-            
-            if current_dpi < target_dpi:
-                scale_factor = target_dpi / current_dpi
-                new_size = (int(processed_image.width * scale_factor), 
-                           int(processed_image.height * scale_factor))
-                processed_image = processed_image.resize(new_size, Image.LANCZOS)
-            
-            return processed_image
+            return _preprocess_image(image, config)
             
         except Exception as e:
             self.log(f"Görüntü ön işleme hatası: {e}", "error")
@@ -399,38 +1837,10 @@ class OCRProcessor:
     def _deskew_image(self, image: Image.Image) -> Image.Image:
         """Görüntü eğim düzeltme"""
         try:
-            # PIL Image'ı OpenCV formatına çevir
-            cv_image = cv2.cvtColor(np.array(image), cv2.COLOR_RGB2BGR)
-            gray = cv2.cvtColor(cv_image, cv2.COLOR_BGR2GRAY)
-            
-            # Kenarları tespit et
-            edges = cv2.Canny(gray, 50, 150, apertureSize=3)
-            
-            # Hough transform ile çizgileri bul
-            lines = cv2.HoughLines(edges, 1, np.pi/180, threshold=100)
-            
-            if lines is not None:
-                # Açıları hesapla
-                angles = []
-                for rho, theta in lines[:10]:  # İlk 10 çizgi
-                    angle = theta * 180 / np.pi
-                    if angle < 90:
-                        angles.append(angle)
-                    else:
-                        angles.append(angle - 180)
-                
-                if angles:
-                    # Ortalama açıyı hesapla
-                    median_angle = np.median(angles)
-                    
-                    # Küçük açıları düzelt
-                    if abs(median_angle) > 0.5:
-                        # Döndür
-                        rotated = image.rotate(-median_angle, expand=True, fillcolor='white')
-                        self.log(f"Eğim düzeltme: {median_angle:.2f}°", "debug")
-                        return rotated
-            
-            return image
+            rotated, angle = _deskew_image(image)
+            if angle:
+                self.log(f"Eğim düzeltme: {angle:.2f}°", "debug")
+            return rotated
             
         except Exception as e:
             self.log(f"Eğim düzeltme hatası: {e}", "warning")
@@ -439,167 +1849,442 @@ class OCRProcessor:
     def process_pdf(self, pdf_path: str, output_dir: str, **kwargs) -> Dict[str, Any]:
         """PDF OCR işleme"""
         try:
-            with self.processing_lock:
-                self.log(f"PDF OCR işlemi başlıyor: {pdf_path}", "info")
-                
-                pdf_path = Path(pdf_path)
-                output_dir = Path(output_dir)
-                output_dir.mkdir(parents=True, exist_ok=True)
-                
-                # Ayarları hazırla
-                config = self.default_config.copy()
-                config.update(kwargs)
-                
-                language = config.get('language', 'tur')
-                auto_detect = config.get('auto_detect', True)
-                dpi = config.get('dpi', 300)
-                
-                # PDF'i sayfalara çevir
-                pages = pdf2image.convert_from_path(
-                    pdf_path,
-                    dpi=dpi,
-                    fmt='RGB'
-                )
-                
-                if not pages:
-                    return {'success': False, 'error': 'PDF sayfaları çevrilemedi'}
-                
-                # Çıktı dosyası
-                output_filename = f"{pdf_path.stem}_ocr.pdf"
-                output_path = output_dir / output_filename
-                
-                # Sayfa metinleri
-                page_texts = []
-                processed_pages = []
+            self.log(f"PDF OCR işlemi başlıyor: {pdf_path}", "info")
+            
+            pdf_path = Path(pdf_path)
+            output_dir = Path(output_dir)
+            output_dir.mkdir(parents=True, exist_ok=True)
+            
+            # Ayarları hazırla
+            config = self.default_config.copy()
+            config.update(kwargs)
+            
+            language = config.get('language', 'tur')
+            auto_detect = config.get('auto_detect', True)
+            dpi = config.get('dpi', 300)
+            
+            # Sayfa planı: hibrit modda metin katmanı olan sayfalar OCR'a girmez
+            page_count = self._get_page_count(pdf_path)
+            if page_count == 0:
+                return {'success': False, 'error': 'PDF sayfaları çevrilemedi'}
+            
+            page_plan = self._plan_pages(pdf_path, config, page_count)
+            ocr_jobs = [(i, plan) for i, plan in enumerate(page_plan)
+                        if plan['action'] in (PAGE_OCR, PAGE_NATIVE)]
+            
+            # Tüm sayfalar boş ve çıkarılacaksa sıfır sayfalı PDF kaydedilemez; çıktı yazılmaz
+            blank_pages = [i + 1 for i, plan in enumerate(page_plan) if plan['action'] == PAGE_BLANK]
+            if config.get('drop_blank_pages', False) and len(blank_pages) == page_count:
+                self.log("Tüm sayfalar boş, çıktı PDF'i oluşturulmadı", "info")
+                return {
+                    'success': True,
+                    'output_path': None,
+                    'language_used': language,
+                    'render_dpi': dpi,
+                    'pages_processed': page_count,
+                    'pages_ocr': 0,
+                    'pages_skipped': 0,
+                    'pages_blank': page_count,
+                    'blank_pages': blank_pages,
+                    'blank_pages_dropped': True,
+                    'pages_native': 0,
+                    'total_text_length': 0,
+                    'output_size': 0
+                }
+            
+            # Süreç sayısı ve süreç içi iş parçacıkları OCR'lanacak sayfa sayısına göre
+            resources = self._plan_resources(len(ocr_jobs), config)
+            
+            # Sayfalar tek tek render edilir, tüm belge bellekte tutulmaz
+            page_iter = self._render_pages(pdf_path, dpi, ocr_jobs)
+            first_page = next(page_iter, None)
+            
+            if first_page is None and ocr_jobs:
+                return {'success': False, 'error': 'PDF sayfaları çevrilemedi'}
+            
+            # Çıktı dosyası
+            output_filename = f"{pdf_path.stem}_ocr.pdf"
+            output_path = output_dir / output_filename
+            
+            # Dil algılama (OCR uygulanacak ilk sayfa için, işçilere dağıtmadan önce)
+            if auto_detect and first_page is not None:
+                detected_lang = self.detect_document_language(_page_image(first_page[1]), _file_fingerprint(pdf_path))
+                if self._languages_installed(detected_lang):
+                    language = detected_lang
+            
+            pages = itertools.chain([first_page] if first_page else [], page_iter)
+            first_page = None
+            summary = {'pages': 0, 'skipped': 0, 'native': 0, 'text_length': 0, 'blank': []}
+            
+            def page_results() -> Iterator[Dict[str, Any]]:
+                # OCR sayfaları paralel işlenir; tüm sayfalar sırasıyla yazıcıya akar
+                ocr_results = self._map_pages(pages, language, config, resources)
                 
-                for i, page_image in enumerate(pages):
-                    self.log(f"Sayfa işleniyor: {i+1}/{len(pages)}", "info")
+                for i, plan in enumerate(page_plan):
+                    summary['pages'] += 1
                     
-                    # Görüntü ön işleme
-                    if config.get('preprocessing', True):
-                        processed_image = self.preprocess_image(page_image, config)
-                    else:
-                        processed_image = page_image
+                    if plan['action'] == PAGE_TEXT:
+                        summary['skipped'] += 1
+                        self.log(f"Sayfa metin katmanı içeriyor, OCR atlandı: {i+1}/{page_count}", "info")
+                        yield {'index': i, 'action': PAGE_TEXT, 'image': None, 'text': '', 'words': []}
+                        continue
                     
-                    # Dil algılama
-                    if auto_detect and i == 0:  # İlk sayfa için algıla
-                        detected_lang = self.auto_detect_language(processed_image)
-                        if detected_lang in self.installed_languages:
-                            language = detected_lang
+                    if plan['action'] == PAGE_BLANK:
+                        summary['blank'].append(i + 1)
+                        self.log(f"Boş sayfa, OCR atlandı: {i+1}/{page_count}", "info")
+                        if not config.get('drop_blank_pages', False):
+                            yield {'index': i, 'action': PAGE_BLANK, 'image': None, 'text': '', 'words': []}
+                        continue
                     
-                    # OCR uygula
-                    ocr_config = f'--psm {config.get("psm", 3)} --oem {config.get("oem", 3)}'
+                    page_result = next(ocr_results)
+                    if self.ocr_cache:
+                        self._record_cache_lookup(page_result['cache_hit'])
                     
-                    try:
-                        text = pytesseract.image_to_string(
-                            processed_image,
-                            lang=language,
-                            config=ocr_config
-                        )
-                        page_texts.append(text)
-                        processed_pages.append(processed_image)
-                        
-                    except Exception as e:
-                        self.log(f"Sayfa {i+1} OCR hatası: {e}", "error")
-                        page_texts.append("")
-                        processed_pages.append(page_image)
-                
-                # Aranabilir PDF oluştur
-                searchable_pdf = self._create_searchable_pdf(
-                    processed_pages, page_texts, str(output_path)
-                )
-                
-                if searchable_pdf:
-                    result = {
-                        'success': True,
-                        'output_path': str(output_path),
-                        'language_used': language,
-                        'pages_processed': len(pages),
-                        'total_text_length': sum(len(text) for text in page_texts),
-                        'output_size': output_path.stat().st_size if output_path.exists() else 0
-                    }
+                    if page_result['error']:
+                        self.log(f"Sayfa {i+1} OCR hatası: {page_result['error']}", "error")
+                    else:
+                        self.log(f"Sayfa işlendi: {i+1}/{page_count}", "info")
                     
-                    self.log(f"OCR işlemi tamamlandı: {output_path}", "info")
-                    return result
-                else:
-                    return {'success': False, 'error': 'Aranabilir PDF oluşturulamadı'}
+                    if plan['action'] == PAGE_NATIVE:
+                        summary['native'] += 1
+                    
+                    summary['text_length'] += len(page_result['text'])
+                    page_result.update(plan)
+                    yield page_result
+            
+            # Aranabilir PDF oluştur
+            searchable_pdf = self._create_searchable_pdf(page_results(), str(output_path), pdf_path)
+            self._prune_cache()
+            
+            if searchable_pdf:
+                result = {
+                    'success': True,
+                    'output_path': str(output_path),
+                    'language_used': language,
+                    'render_dpi': dpi,
+                    'pages_processed': summary['pages'],
+                    'pages_ocr': summary['pages'] - summary['skipped'] - len(summary['blank']),
+                    'pages_skipped': summary['skipped'],
+                    'pages_blank': len(summary['blank']),
+                    'blank_pages': summary['blank'],
+                    'blank_pages_dropped': config.get('drop_blank_pages', False),
+                    'pages_native': summary['native'],
+                    'total_text_length': summary['text_length'],
+                    'output_size': output_path.stat().st_size if output_path.exists() else 0
+                }
+                
+                self.log(f"OCR işlemi tamamlandı: {output_path}", "info")
+                return result
+            else:
+                return {'success': False, 'error': 'Aranabilir PDF oluşturulamadı'}
                 
         except Exception as e:
             self.log(f"PDF OCR işlem hatası: {e}", "error")
             return {'success': False, 'error': str(e)}
     
-    def _create_searchable_pdf(self, images: List[Image.Image], texts: List[str], output_path: str) -> bool:
-        """Aranabilir PDF oluştur"""
+    def _plan_resources(self, jobs: int, config: Dict) -> Dict[str, int]:
+        """İş için kaynak planı oluştur, bölge iş parçacıklarını ayarlara yansıt"""
+        intra_page = config.get('text_regions', False) or config.get('selective_reocr', False)
+        resources = plan_resources(jobs, self.max_workers, intra_page)
+        
+        if 'region_workers' not in config:
+            config['region_workers'] = resources['region_workers']
+        
+        self.resource_plan = resources
+        self.log(
+            f"Kaynak planı: {resources['processes']}/{resources['pool_processes']} süreç, {resources['omp_threads']} Tesseract, "
+            f"{resources['cv_threads']} OpenCV, {resources['region_workers']} bölge iş parçacığı "
+            f"({resources['cores']} çekirdek)", "info"
+        )
+        return resources
+    
+    def _get_page_pool(self, resources: Dict[str, int]) -> concurrent.futures.ProcessPoolExecutor:
+        """
+        Paylaşılan sayfa işçi havuzunu al (ilk kullanımda oluşturulur)
+        Havuz boyutu işten bağımsızdır; eşzamanlı belgeler aynı havuzu ve işçilerdeki kalıcı motorları kullanır
+        """
+        with self._pool_lock:
+            if self._page_pool is None:
+                # spawn: işçiler ana süreçte yüklenmiş olabilecek OpenMP durumunu miras almaz,
+                # sınırlar tesserocr yüklenmeden önce başlatıcıda uygulanır
+                self._page_pool = concurrent.futures.ProcessPoolExecutor(
+                    max_workers=resources['pool_processes'],
+                    mp_context=multiprocessing.get_context('spawn'),
+                    initializer=_init_ocr_worker,
+                    initargs=(pytesseract.pytesseract.tesseract_cmd,
+                              resources['omp_threads'], resources['cv_threads'])
+                )
+            return self._page_pool
+    
+    def _get_page_buffers(self) -> _SharedPageBuffers:
+        """Paylaşımlı sayfa tamponu havuzunu al (gerekirse oluştur)"""
+        with self._pool_lock:
+            if self._page_buffers is None:
+                self._page_buffers = _SharedPageBuffers()
+            return self._page_buffers
+    
+    def _get_page_count(self, pdf_path: Path) -> int:
+        """PDF sayfa sayısını al"""
+        if PYMUPDF_AVAILABLE:
+            with fitz.open(str(pdf_path)) as doc:
+                return doc.page_count
+        
+        return int(pdf2image.pdfinfo_from_path(str(pdf_path))['Pages'])
+    
+    def _plan_pages(self, pdf_path: Path, config: Dict, page_count: int) -> List[Dict[str, Any]]:
+        """Her sayfa için işlem türünü ve geometrisini belirle (PAGE_OCR / PAGE_NATIVE / PAGE_TEXT / PAGE_BLANK)"""
+        hybrid = config.get('ocr_mode', 'force') == 'hybrid'
+        native_images = config.get('native_images', True)
+        blank_detection = config.get('blank_detection', True)
+        
+        if not PYMUPDF_AVAILABLE:
+            if hybrid:
+                self.log("Hibrit OCR modu PyMuPDF gerektirir, tüm sayfalar OCR'a alınıyor", "warning")
+            if blank_detection:
+                self.log("Boş sayfa tespiti PyMuPDF gerektirir, atlanıyor", "warning")
+            return [{'action': PAGE_OCR} for _ in range(page_count)]
+        
+        min_chars = config.get('hybrid_min_chars', 20)
+        plan = []
+        
+        with fitz.open(str(pdf_path)) as doc:
+            for page in doc:
+                # Çıktı sayfası kaynak sayfanın (döndürülmüş) görünür boyutlarını korur
+                page_plan = {'action': PAGE_OCR, 'rect': tuple(page.rect)}
+                
+                if hybrid and _page_has_usable_text(page, min_chars):
+                    page_plan['action'] = PAGE_TEXT
+                elif blank_detection and _page_is_blank(page, config):
+                    page_plan['action'] = PAGE_BLANK
+                else:
+                    placement = _single_image_placement(page) if native_images else None
+                    if placement:
+                        xref, bbox = placement
+                        page_plan.update({'action': PAGE_NATIVE, 'xref': xref, 'bbox': tuple(bbox)})
+                
+                plan.append(page_plan)
+        
+        return plan
+    
+    def _render_pages(self, pdf_path: Path, dpi: int,
+                      jobs: List[Tuple[int, Dict[str, Any]]]) -> Iterator[Tuple[int, Any, Dict[str, Any]]]:
+        """İstenen PDF sayfalarını sırayla raster'a çevir (her seferinde tek sayfa; PyMuPDF ile Pixmap, yoksa PIL görüntüsü)"""
+        if PYMUPDF_AVAILABLE:
+            with fitz.open(str(pdf_path)) as doc:
+                for i, plan in jobs:
+                    if plan['action'] == PAGE_NATIVE:
+                        # Tam sayfa tarama: gömülü görüntü kendi çözünürlüğünde, render edilmeden
+                        yield i, _extract_native_pixmap(doc, plan['xref'], fitz.Rect(plan['bbox'])), plan
+                        continue
+                    
+                    # Pixmap olduğu gibi aktarılır; pikseller yalnızca işçiye giderken kopyalanır
+                    yield i, doc[i].get_pixmap(dpi=dpi, alpha=False), plan
+            return
+        
+        for i, plan in jobs:
+            rendered = pdf2image.convert_from_path(
+                pdf_path,
+                dpi=dpi,
+                fmt='RGB',
+                first_page=i + 1,
+                last_page=i + 1
+            )
+            if rendered:
+                rendered[0].info['dpi'] = (dpi, dpi)
+                yield i, rendered[0], plan
+    
+    def _map_pages(self, pages: Iterable[Tuple[int, Any, Dict[str, Any]]], language: str,
+                   config: Dict, resources: Dict[str, int]):
+        """Sayfaları işçi havuzunda işle, sonuçları sayfa sırasıyla üret"""
+        # Yalnızca render edilen sayfaların görüntüsü çıktıya yazılır (taramalar kaynaktan kopyalanır)
+        if resources['processes'] <= 1:
+            with _thread_limits(resources['omp_threads'], resources['cv_threads']):
+                for i, page, plan in pages:
+                    yield _ocr_page_worker(i, _page_image(page), language, config,
+                                           plan['action'] == PAGE_OCR, self.ocr_cache)
+            return
+        
+        # Aynı anda işlenen sayfa sayısı sınırlı tutulur (iş başına paralellik), bellek kullanımı sayfa sayısından bağımsızdır
+        max_inflight = max(1, config.get('max_inflight_pages') or resources['processes'] * 2)
+        pool = self._get_page_pool(resources)
+        buffers = self._get_page_buffers()
+        pending = collections.deque()
+        
+        def collect():
+            future, block = pending.popleft()
+            try:
+                return future.result()
+            finally:
+                buffers.release(block)
+        
+        try:
+            for i, page, plan in pages:
+                # Pikseller paylaşımlı belleğe kopyalanır, işçiye yalnızca tanımlayıcı gider
+                descriptor, block = buffers.put(page)
+                page = None
+                
+                pending.append((pool.submit(
+                    _ocr_page_worker, i, descriptor, language, config,
+                    plan['action'] == PAGE_OCR, self.ocr_cache
+                ), block))
+                
+                if len(pending) >= max_inflight:
+                    yield collect()
+            
+            while pending:
+                yield collect()
+        
+        finally:
+            # Yarıda kesilirse bloklar işçiler bitirdikten sonra havuza döner
+            concurrent.futures.wait([future for future, _ in pending])
+            while pending:
+                buffers.release(pending.popleft()[1])
+    
+    def _create_searchable_pdf(self, pages: Iterable[Dict[str, Any]],
+                               output_path: str, source_path: Path = None) -> bool:
+        """Aranabilir PDF oluştur (sayfalar geldikçe yazılır)"""
+        if PYMUPDF_AVAILABLE:
+            return self._write_searchable_pdf(pages, output_path, source_path)
+        
         try:
             from reportlab.pdfgen import canvas
-            from reportlab.lib.pagesizes import A4
             from reportlab.lib.utils import ImageReader
-            from reportlab.pdfbase import pdfmetrics
-            from reportlab.pdfbase.ttfonts import TTFont
-            import io
-            
+        except ImportError:
+            # Alternatif yöntem: img2pdf kullan
+            return self._create_image_pdf(pages, output_path)
+        
+        try:
             # PDF oluştur
-            c = canvas.Canvas(output_path, pagesize=A4)
+            c = canvas.Canvas(output_path)
             
-            for i, (image, text) in enumerate(zip(images, texts)):
+            for i, page_result in enumerate(pages):
                 if i > 0:
                     c.showPage()  # Yeni sayfa
                 
-                # Görüntüyü ekle
-                img_buffer = io.BytesIO()
-                image.save(img_buffer, format='PNG')
-                img_buffer.seek(0)
+                # Sayfa boyutu görüntünün render çözünürlüğünden
+                image = page_result['image']
+                page_width = image['width'] * 72 / image['dpi']
+                page_height = image['height'] * 72 / image['dpi']
+                c.setPageSize((page_width, page_height))
                 
-                img_reader = ImageReader(img_buffer)
-                c.drawImage(img_reader, 0, 0, width=A4[0], height=A4[1])
+                # Görüntüyü ekle (JPEG / G4 TIFF)
+                img_reader = ImageReader(io.BytesIO(image['data']))
+                c.drawImage(img_reader, 0, 0, width=page_width, height=page_height)
                 
-                # Metni görünmez şekilde ekle (arama için)
-                if text.strip():
-                    c.setFillColorRGB(1, 1, 1, alpha=0)  # Şeffaf beyaz
-                    c.setFont("Helvetica", 8)
-                    
-                    # Metin satırlarını ekle
-                    lines = text.split('\n')
-                    y_position = A4[1] - 20
-                    
-                    for line in lines[:50]:  # İlk 50 satır
-                        if line.strip():
-                            c.drawString(10, y_position, line[:100])  # İlk 100 karakter
-                            y_position -= 12
-                        
-                        if y_position < 20:
-                            break
+                # Kelimeler OCR kutularına görünmez metin olarak yerleştirilir (arama ve seçim için)
+                if page_result['words']:
+                    self._draw_reportlab_words(c, page_result, page_width, page_height)
             
             c.save()
             return True
             
         except Exception as e:
             self.log(f"Aranabilir PDF oluşturma hatası: {e}", "error")
-            
-            # Alternatif yöntem: img2pdf kullan
-            try:
-                import img2pdf
+            return False
+    
+    def _draw_reportlab_words(self, c, page_result: Dict[str, Any], page_width: float, page_height: float):
+        """Kelimeleri reportlab tuvaline görünmez metin olarak, kutularına oturacak şekilde yaz"""
+        from reportlab.pdfbase.pdfmetrics import stringWidth
+        
+        text_object = c.beginText()
+        text_object.setTextRenderMode(3)  # Görünmez
+        
+        for text, left, baseline, width, height in _word_boxes(
+            page_result['words'], page_result['ocr_size'], page_result['angle'], (0, 0, page_width, page_height)
+        ):
+            unit_length = stringWidth(text, 'Helvetica', 1)
+            if unit_length <= 0 or width <= 0:
+                continue
+            fontsize = max(1.0, min(width / unit_length, height * 1.5))
+            
+            # reportlab koordinatları sayfanın altından başlar
+            text_object.setFont('Helvetica', fontsize)
+            text_object.setTextOrigin(left, page_height - (baseline - height * 0.2))
+            text_object.textOut(text)
+        
+        c.drawText(text_object)
+    
+    def _write_searchable_pdf(self, pages: Iterable[Dict[str, Any]],
+                              output_path: str, source_path: Path = None) -> bool:
+        """Aranabilir PDF'i PyMuPDF ile sayfa sayfa yaz (kaynak sayfa geometrisi ve kelime konumları korunur)"""
+        source = None
+        output = fitz.open()
+        fonts = {'latin': fitz.Font('helv')}
+        
+        try:
+            for page_result in pages:
+                i, action = page_result['index'], page_result['action']
                 
-                # Görüntüleri geçici dosyalar olarak kaydet
-                temp_images = []
-                with tempfile.TemporaryDirectory() as temp_dir:
-                    for i, image in enumerate(images):
-                        temp_path = Path(temp_dir) / f"page_{i}.png"
-                        image.save(temp_path)
-                        temp_images.append(str(temp_path))
+                if action in (PAGE_TEXT, PAGE_NATIVE, PAGE_BLANK):
+                    # Sayfa (ve gömülü tarama görüntüsü) olduğu gibi kopyalanır
+                    if source is None:
+                        source = fitz.open(str(source_path))
+                    output.insert_pdf(source, from_page=i, to_page=i, final=False)
+                    page = output[-1]
+                    target_rect = fitz.Rect(page_result['bbox']) if action == PAGE_NATIVE else page.rect
                     
-                    # PDF oluştur
-                    with open(output_path, "wb") as f:
-                        f.write(img2pdf.convert(temp_images))
+                    # Daha önce OCR'lanmış taramanın eski metin katmanı yenisiyle çift arama sonucu üretir
+                    if action == PAGE_NATIVE and page.get_text('text').strip():
+                        _remove_text_layer(page)
+                else:
+                    page = output.new_page(width=fitz.Rect(page_result['rect']).width,
+                                           height=fitz.Rect(page_result['rect']).height)
+                    target_rect = page.rect
+                    
+                    # Sayfa görüntüsü işçide kodlandı (G4 / JPEG), olduğu gibi gömülür
+                    image = page_result.pop('image')
+                    if image['format'] == 'tiff':
+                        _insert_ccitt_image(output, page, target_rect, image['data'])
+                    else:
+                        page.insert_image(target_rect, stream=image['data'], keep_proportion=False)
+                    image = None
                 
-                return True
+                # Kelimeleri görünmez metin olarak konumlarına yerleştir (arama ve seçim için)
+                if page_result['words']:
+                    _insert_text_layer(page, page_result['words'], page_result['ocr_size'],
+                                       page_result['angle'], target_rect, fonts)
+            
+            # Yalnızca kullanılan glifler gömülür
+            output.subset_fonts()
+            output.save(output_path, garbage=3, deflate=True)
+            return True
+            
+        except Exception as e:
+            self.log(f"Aranabilir PDF oluşturma hatası: {e}", "error")
+            return False
+        
+        finally:
+            output.close()
+            if source is not None:
+                source.close()
+    
+    def _create_image_pdf(self, pages: Iterable[Dict[str, Any]], output_path: str) -> bool:
+        """Metin katmanı olmadan görüntü PDF'i oluştur (img2pdf, JPEG/G4 verisi yeniden kodlanmaz)"""
+        try:
+            import img2pdf
+            
+            # Görüntüleri geçici dosyalar olarak kaydet
+            temp_images = []
+            with tempfile.TemporaryDirectory() as temp_dir:
+                for i, page_result in enumerate(pages):
+                    image = page_result['image']
+                    extension = 'tif' if image['format'] == 'tiff' else 'jpg'
+                    temp_path = Path(temp_dir) / f"page_{i}.{extension}"
+                    temp_path.write_bytes(image['data'])
+                    temp_images.append(str(temp_path))
                 
-            except ImportError:
-                self.log("img2pdf modülü bulunamadı", "warning")
-                return False
-            except Exception as e:
-                self.log(f"img2pdf ile PDF oluşturma hatası: {e}", "error")
-                return False
+                # PDF oluştur
+                with open(output_path, "wb") as f:
+                    f.write(img2pdf.convert(temp_images))
+            
+            return True
+            
+        except ImportError:
+            self.log("img2pdf modülü bulunamadı", "warning")
+            return False
+        except Exception as e:
+            self.log(f"img2pdf ile PDF oluşturma hatası: {e}", "error")
+            return False
     
     def extract_text_from_image(self, image_path: str, language: str = None, config: Dict = None) -> Dict[str, Any]:
         """Görüntüden metin çıkarma"""
@@ -616,47 +2301,49 @@ class OCRProcessor:
             config = config or self.default_config
             language = language or 'tur'
             
-            # Dil algılama
-            if config.get('auto_detect', True):
-                detected_lang = self.auto_detect_language(image)
-                if detected_lang in self.installed_languages:
-                    language = detected_lang
+            # Önbellek, dil algılama dahil tüm Tesseract çağrılarından önce denenir
+            cache_key = None
+            cached = None
+            if self.ocr_cache:
+                cache_key = OCRCache.make_key(image, language, config, kind='image')
+                cached = self.ocr_cache.get(cache_key)
+                self._record_cache_lookup(cached is not None)
             
-            # Görüntü ön işleme
-            if config.get('preprocessing', True):
-                processed_image = self.preprocess_image(image, config)
+            if cached:
+                entry = cached
             else:
-                processed_image = image
-            
-            # OCR uygula
-            ocr_config = f'--psm {config.get("psm", 3)} --oem {config.get("oem", 3)}'
-            
-            text = pytesseract.image_to_string(
-                processed_image,
-                lang=language,
-                config=ocr_config
-            )
-            
-            # Güven skorunu al
-            data = pytesseract.image_to_data(
-                processed_image,
-                lang=language,
-                config=ocr_config,
-                output_type=pytesseract.Output.DICT
-            )
+                # Dil algılama (yalnızca OSD; Latin yazıda istenen dil korunur,
+                # böylece metin tanıma tek geçişte yapılır)
+                if config.get('auto_detect', True):
+                    script = self.detect_script(_language_sample(image))
+                    detected_lang = SCRIPT_LANGUAGES.get(script)
+                    if script != 'Latin' and detected_lang in self.installed_languages:
+                        language = detected_lang
+                
+                # Ön işleme ve OCR
+                entry = _recognize_image(image, language, config)
+                
+                if self.ocr_cache:
+                    self.ocr_cache.put(cache_key, entry)
             
-            confidences = [int(conf) for conf in data['conf'] if int(conf) > 0]
-            avg_confidence = sum(confidences) / len(confidences) if confidences else 0
+            text = entry['text']
             
-            return {
+            result = {
                 'success': True,
                 'text': text,
-                'language_used': language,
-                'confidence': avg_confidence,
+                'language_used': entry['language_used'],
+                'confidence': entry['confidence'],
+                'words': entry['words'],
                 'word_count': len(text.split()),
                 'character_count': len(text)
             }
             
+            for key in ('hocr', 'alto'):
+                if key in entry:
+                    result[key] = entry[key]
+            
+            return result
+            
         except Exception as e:
             self.log(f"Görüntü OCR hatası: {e}", "error")
             return {'success': False, 'error': str(e)}
@@ -667,23 +2354,30 @@ class OCRProcessor:
             image = Image.open(image_path)
             language = language or 'tur'
             
-            # Detaylı OCR verisi al
-            data = pytesseract.image_to_data(
-                image,
-                lang=language,
-                output_type=pytesseract.Output.DICT
-            )
+            # Detaylı OCR verisi al (önbellekte yoksa)
+            cached = None
+            if self.ocr_cache:
+                cache_key = OCRCache.make_key(image, language, {}, kind='boxes')
+                cached = self.ocr_cache.get(cache_key)
+                self._record_cache_lookup(cached is not None)
+            
+            if cached:
+                words = cached['words']
+            else:
+                words = get_tesseract_engine(language).recognize(image)['words']
+                if self.ocr_cache:
+                    self.ocr_cache.put(cache_key, {'words': words})
             
             text_boxes = []
-            for i in range(len(data['text'])):
-                if int(data['conf'][i]) > 30:  # Güven skoru > 30
+            for word in words:
+                if word['confidence'] > 30:  # Güven skoru > 30
                     text_boxes.append({
-                        'text': data['text'][i],
-                        'confidence': int(data['conf'][i]),
-                        'left': int(data['left'][i]),
-                        'top': int(data['top'][i]),
-                        'width': int(data['width'][i]),
-                        'height': int(data['height'][i])
+                        'text': word['text'],
+                        'confidence': int(word['confidence']),
+                        'left': word['left'],
+                        'top': word['top'],
+                        'width': word['width'],
+                        'height': word['height']
                     })
             
             return text_boxes
@@ -692,45 +2386,135 @@ class OCRProcessor:
             self.log(f"Metin kutuları alma hatası: {e}", "error")
             return []
     
-    def batch_process_images(self, image_paths: List[str], output_dir: str, **kwargs) -> Dict[str, Any]:
-        """Toplu görüntü OCR işleme"""
+    def batch_process_images(self, image_paths: List[str], output_dir: str, callback=None,
+                             resume: bool = True, **kwargs) -> Dict[str, Any]:
+        """Toplu görüntü OCR işleme (sonuçlar callback ile tek tek bildirilir, bellekte yalnızca sayaçlar tutulur)"""
         try:
-            output_dir = Path(output_dir)
-            output_dir.mkdir(parents=True, exist_ok=True)
-            
-            results = []
-            
-            for i, image_path in enumerate(image_paths):
-                self.log(f"Görüntü işleniyor: {i+1}/{len(image_paths)}", "info")
-                
-                result = self.extract_text_from_image(image_path, **kwargs)
-                result['image_path'] = image_path
-                results.append(result)
+            image_paths = [str(path) for path in image_paths]
+            counts = {'successful': 0, 'failed': 0, 'skipped': 0}
+            
+            for i, result in enumerate(self.iter_process_images(image_paths, output_dir, resume=resume, **kwargs)):
+                if result.get('skipped'):
+                    counts['skipped'] += 1
+                elif result['success']:
+                    counts['successful'] += 1
+                    self.log(f"Görüntü işlendi: {i+1}/{len(image_paths)}", "info")
+                else:
+                    counts['failed'] += 1
+                    self.log(f"Görüntü OCR hatası ({result['image_path']}): {result.get('error')}", "error")
                 
-                # Metin dosyasını kaydet
-                if result['success']:
-                    text_file = output_dir / f"{Path(image_path).stem}.txt"
-                    with open(text_file, 'w', encoding='utf-8') as f:
-                        f.write(result['text'])
-                    result['text_file'] = str(text_file)
+                if callback:
+                    callback(result)
             
-            # Özet rapor
-            successful = [r for r in results if r['success']]
-            failed = [r for r in results if not r['success']]
+            self._prune_cache()
             
+            # Özet rapor
             return {
                 'success': True,
                 'total_processed': len(image_paths),
-                'successful': len(successful),
-                'failed': len(failed),
-                'results': results,
-                'output_directory': str(output_dir)
+                'successful': counts['successful'],
+                'failed': counts['failed'],
+                'skipped': counts['skipped'],
+                'output_directory': str(output_dir),
+                'manifest_path': str(Path(output_dir) / BATCH_MANIFEST_NAME)
             }
             
         except Exception as e:
             self.log(f"Toplu OCR işlem hatası: {e}", "error")
             return {'success': False, 'error': str(e)}
     
+    def iter_process_images(self, image_paths: Iterable[str], output_dir: str, language: str = None,
+                            config: Dict = None, resume: bool = True) -> Iterator[Dict[str, Any]]:
+        """Görüntüleri işçi havuzunda OCR'la; metin dosyaları hemen yazılır, sonuçlar girdi sırasıyla üretilir"""
+        output_dir = Path(output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        
+        config = config or self.default_config
+        language = language or 'tur'
+        image_paths = [str(path) for path in image_paths]
+        
+        # Önceki çalıştırmada tamamlanan görüntüler atlanır
+        manifest_path = output_dir / BATCH_MANIFEST_NAME
+        completed = self._read_batch_manifest(manifest_path) if resume else set()
+        todo = [path for path in image_paths if path not in completed]
+        
+        if completed:
+            self.log(f"Önceki çalıştırmadan {len(image_paths) - len(todo)} görüntü atlanıyor", "info")
+        
+        # Dil toplu iş için bir kez, ilk görüntünün küçük bir örneğinde algılanır
+        if config.get('auto_detect', True) and todo:
+            try:
+                with Image.open(todo[0]) as first_image:
+                    detected_lang = self.detect_document_language(first_image, _file_fingerprint(todo[0]))
+                if self._languages_installed(detected_lang):
+                    language = detected_lang
+                    config = dict(config, auto_detect=False)
+            except Exception as e:
+                self.log(f"Toplu iş dil algılama hatası: {e}", "warning")
+        
+        # Süreç sayısı ve iş parçacıkları görüntü sayısına göre planlanır
+        config = dict(config)
+        resources = self._plan_resources(len(todo), config)
+        serial = resources['processes'] <= 1
+        
+        # Aynı anda işlenen görüntü sayısı sınırlı, sonuçlar sırayla teslim edilir
+        pool = None if serial else self._get_page_pool(resources)
+        max_inflight = max(1, config.get('max_inflight_pages') or resources['processes'] * 2)
+        pending = collections.deque()
+        
+        def submit(path):
+            if path in completed:
+                return {'image_path': path, 'success': True, 'skipped': True}
+            if serial:
+                return _ocr_image_worker(path, str(output_dir), language, config, self.ocr_cache)
+            return pool.submit(_ocr_image_worker, path, str(output_dir), language, config, self.ocr_cache)
+        
+        def collect(item):
+            result = item if isinstance(item, dict) else item.result()
+            
+            if not result.get('skipped'):
+                if self.ocr_cache:
+                    self._record_cache_lookup(result['cache_hit'])
+                if result['success']:
+                    manifest.write(json.dumps(
+                        {'image_path': result['image_path'], 'text_file': result['text_file']},
+                        ensure_ascii=False
+                    ) + '\n')
+                    manifest.flush()
+            
+            return result
+        
+        limits = _thread_limits(resources['omp_threads'], resources['cv_threads']) if serial else contextlib.nullcontext()
+        
+        with limits, open(manifest_path, 'a' if resume else 'w', encoding='utf-8') as manifest:
+            for path in image_paths:
+                pending.append(submit(path))
+                
+                if len(pending) >= max_inflight:
+                    yield collect(pending.popleft())
+            
+            while pending:
+                yield collect(pending.popleft())
+    
+    def _read_batch_manifest(self, manifest_path: Path) -> set:
+        """Toplu iş manifestinden metin dosyası hâlâ mevcut olan tamamlanmış görüntüleri oku"""
+        completed = set()
+        if not manifest_path.exists():
+            return completed
+        
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # Yarıda kesilmiş son satır
+                    continue
+                
+                if Path(entry.get('text_file', '')).exists():
+                    completed.add(entry['image_path'])
+        
+        return completed
+    
     def log(self, message: str, level: str = "info"):
         """Log mesajı"""
         if self.log_manager:
@@ -738,9 +2522,39 @@ class OCRProcessor:
         else:
             print(f"OCR {level.upper()}: {message}")
     
+    def _record_cache_lookup(self, hit: bool):
+        """Önbellek isabet/ıska sayaçlarını güncelle"""
+        with self.processing_lock:
+            self.cache_stats['hits' if hit else 'misses'] += 1
+    
+    def _prune_cache(self):
+        """Önbellek boyut sınırını aşmışsa en eski kayıtları sil"""
+        if not self.ocr_cache:
+            return
+        
+        removed = self.ocr_cache.prune()
+        if removed:
+            self.log(f"OCR önbelleğinden {removed} eski kayıt silindi", "info")
+    
+    def clear_cache(self):
+        """OCR önbelleğini temizle"""
+        if self.ocr_cache:
+            self.ocr_cache.clear()
+        self.cache_stats = {'hits': 0, 'misses': 0}
+    
     def cleanup(self):
         """Temizlik işlemleri"""
-        pass
+        close_tesseract_engines()
+        _shutdown_region_pool()
+        
+        with self._pool_lock:
+            if self._page_pool is not None:
+                self._page_pool.shutdown(wait=True)
+                self._page_pool = None
+            
+            if self._page_buffers is not None:
+                self._page_buffers.close()
+                self._page_buffers = None
     
     def get_statistics(self) -> Dict[str, Any]:
         """OCR istatistikleri"""
@@ -748,7 +2562,13 @@ class OCRProcessor:
             'installed_languages': len(self.installed_languages),
             'available_languages': len(self.available_languages),
             'tesseract_available': DEPENDENCIES_AVAILABLE,
-            'default_language': self.default_languages[0] if self.default_languages else 'eng'
+            'ocr_engine': get_engine_name(),
+            'default_language': self.default_languages[0] if self.default_languages else 'eng',
+            'cache_enabled': self.ocr_cache is not None,
+            'cache_hits': self.cache_stats['hits'],
+            'cache_misses': self.cache_stats['misses'],
+            'cache_size': self.ocr_cache.size() if self.ocr_cache else 0,
+            'resource_plan': self.resource_plan
         }
 
 # OCR dil kodları ve isimleri eşlemesi
@@ -772,89 +2592,3 @@ OCR_LANGUAGE_NAMES = {
 def get_language_display_name(lang_code: str) -> str:
     """Dil kodundan görünen isim al"""
     return OCR_LANGUAGE_NAMES.get(lang_code, lang_code.upper())
-_dir / f"{language_code}.traineddata"
-            lang_file.write_bytes(response.content)
-            
-            # Yüklü dilleri yeniden tespit et
-            self.detect_installed_languages()
-            
-            self.log(f"Dil paketi başarıyla kuruldu: {language_code}", "info")
-            return True
-            
-        except Exception as e:
-            self.log(f"Windows dil paketi kurulum hatası: {e}", "error")
-            return False
-    
-    def _install_language_linux(self, language_code: str) -> bool:
-        """Linux için dil paketi kur"""
-        try:
-            # Paket yöneticisi ile kur
-            commands = [
-                f"sudo apt-get install -y tesseract-ocr-{language_code}",
-                f"sudo yum install -y tesseract-langpack-{language_code}",
-                f"sudo pacman -S tesseract-data-{language_code}"
-            ]
-            
-            for cmd in commands:
-                try:
-                    result = subprocess.run(cmd.split(), capture_output=True, text=True)
-                    if result.returncode == 0:
-                        self.detect_installed_languages()
-                        return True
-                except:
-                    continue
-            
-            # Manuel indirme
-            return self._download_language_data(language_code)
-            
-        except Exception as e:
-            self.log(f"Linux dil paketi kurulum hatası: {e}", "error")
-            return False
-    
-    def _install_language_macos(self, language_code: str) -> bool:
-        """macOS için dil paketi kur"""
-        try:
-            # Homebrew ile kur
-            cmd = f"brew install tesseract-lang"
-            result = subprocess.run(cmd.split(), capture_output=True, text=True)
-            
-            if result.returncode == 0:
-                self.detect_installed_languages()
-                return True
-            
-            # Manuel indirme
-            return self._download_language_data(language_code)
-            
-        except Exception as e:
-            self.log(f"macOS dil paketi kurulum hatası: {e}", "error")
-            return False
-    
-    def _download_language_data(self, language_code: str) -> bool:
-        """Dil verisini manuel indir"""
-        try:
-            url = f"https://github.com/tesseract-ocr/tessdata/raw/main/{language_code}.traineddata"
-            
-            # Sistem tessdata dizinini bul
-            possible_dirs = [
-                '/usr/share/tesseract-ocr/4.00/tessdata',
-                '/usr/share/tesseract-ocr/tessdata',
-                '/usr/local/share/tessdata',
-                '/opt/homebrew/share/tessdata'
-            ]
-            
-            tessdata_dir = None
-            for dir_path in possible_dirs:
-                if Path(dir_path).exists():
-                    tessdata_dir = Path(dir_path)
-                    break
-            
-            if not tessdata_dir:
-                self.log("Tessdata dizini bulunamadı", "error")
-                return False
-            
-            # İndir
-            response = requests.get(url, timeout=30)
-            response.raise_for_status()
-            
-            # Kaydet
-            lang_file = tessdata
\ No newline at end of file
@@ -0,0 +1,329 @@
+# resources/content_utils.py
+"""
+PyPDF-Stirling Tools v2 - Content Stream Utilities
+Sayfa içerik akışlarını ayrıştırma, sadeleştirme ve küçültme
+"""
+
+import re
+import math
+from typing import List, Dict, Optional, Tuple
+
+# PDF sözdizimi karakter sınıfları
+_WHITESPACE = b'\x00\t\n\x0c\r '
+_DELIMITERS = b'()<>[]{}/%'
+_NUMBER_PATTERN = re.compile(rb'^[+-]?(\d+\.?\d*|\.\d+)$')
+# Satır içi görüntü verisinin sonu: boşluk + EI + boşluk / ayraç / akış sonu
+_INLINE_IMAGE_END = re.compile(rb'[\x00\t\n\x0c\r ]EI(?=[\x00\t\n\x0c\r ()<>\[\]{}/%]|$)')
+
+# Grafik durumu parametreleri: operatör -> durum anahtarı (aynı değeri tekrar yazan operatör gereksizdir)
+STATE_OPERATORS = {
+    b'w': 'line_width', b'J': 'line_cap', b'j': 'line_join', b'M': 'miter_limit', b'd': 'dash',
+    b'ri': 'intent', b'i': 'flatness',
+    b'g': 'fill', b'rg': 'fill', b'k': 'fill', b'G': 'stroke', b'RG': 'stroke', b'K': 'stroke',
+    b'Tc': 'char_spacing', b'Tw': 'word_spacing', b'Tz': 'scale', b'TL': 'leading',
+    b'Tf': 'font', b'Tr': 'render_mode', b'Ts': 'rise'
+}
+# Bilinmeyen etkisi olan operatörler izlenen durumu geçersiz kılar
+STATE_RESETS = {b'gs': None, b'cs': ('fill',), b'sc': ('fill',), b'scn': ('fill',),
+                b'CS': ('stroke',), b'SC': ('stroke',), b'SCN': ('stroke',)}
+
+PATH_CONSTRUCTION = {b'm', b'l', b'c', b'v', b'y', b're', b'h'}
+PATH_PAINTING = {b'S', b's', b'f', b'F', b'f*', b'B', b'B*', b'b', b'b*', b'n'}
+PATH_STROKING = {b'S', b's', b'B', b'B*', b'b', b'b*'}
+PATH_CLIPPING = {b'W', b'W*'}
+TEXT_SHOWING = {b'Tj', b'TJ'}
+
+# Sayfa dışı kabulünde kenar payı (punto; yuvarlama için); konturlarda çizgi kalınlığı ayrıca eklenir
+OFFPAGE_MARGIN = 10
+# Çizgi durumu varsayılanları (PDF): kalınlık 1, sivri birleşim sınırı 10
+DEFAULT_LINE = {'width': 1.0, 'miter': 10.0}
+
+Operation = Tuple[List[bytes], bytes]
+
+def _tokenize(data: bytes):
+    """İçerik akışını belirteçlere ayır; satır içi görüntüler tek parça (b'BI', ham veri) olarak döner"""
+    length = len(data)
+    position = 0
+    
+    while position < length:
+        char = data[position]
+        
+        if char in _WHITESPACE:
+            position += 1
+        
+        elif char == 0x25:  # % yorum: satır sonuna kadar atlanır
+            while position < length and data[position] not in b'\r\n':
+                position += 1
+        
+        elif char == 0x28:  # ( dizgi: iç içe parantez ve kaçış karakterleri
+            start, depth = position, 0
+            while position < length:
+                current = data[position]
+                if current == 0x5C:
+                    position += 2
+                    continue
+                if current == 0x28:
+                    depth += 1
+                elif current == 0x29:
+                    depth -= 1
+                    if depth == 0:
+                        break
+                position += 1
+            position += 1
+            yield data[start:position]
+        
+        elif char == 0x3C:  # < onaltılı dizgi ya da <<
+            if data[position + 1:position + 2] == b'<':
+                position += 2
+                yield b'<<'
+            else:
+                end = data.index(b'>', position)
+                yield b'<' + bytes(b for b in data[position + 1:end] if b not in _WHITESPACE) + b'>'
+                position = end + 1
+        
+        elif char == 0x3E:  # >>
+            position += 2
+            yield b'>>'
+        
+        elif char in b'[]{}':
+            position += 1
+            yield bytes([char])
+        
+        else:  # Ad, sayı ya da operatör
+            start = position
+            position += 1
+            while position < length and data[position] not in _WHITESPACE and data[position] not in _DELIMITERS:
+                position += 1
+            token = data[start:position]
+            
+            if token == b'ID':
+                # Ham görüntü verisi ID'den sonraki tek boşluktan EI'ye kadar sürer
+                match = _INLINE_IMAGE_END.search(data, position + 1)
+                end = match.start() if match else length
+                yield (b'ID', data[position + 1:end])
+                position = match.end() if match else length
+            else:
+                yield token
+
+def _is_operator(token: bytes) -> bool:
+    """Belirteç bir operatör mü (sayı, ad, dizgi, ayraç ve true / false / null değil)"""
+    first = token[:1]
+    return (
+        first not in (b'/', b'(', b'<', b'>', b'[', b']', b'{', b'}')
+        and token not in (b'true', b'false', b'null')
+        and not _NUMBER_PATTERN.match(token)
+    )
+
+def parse_content(data: bytes) -> List[Operation]:
+    """İçerik akışını (işlenenler, operatör) listesine çevir; satır içi görüntü BI operatörüyle tek işlemdir"""
+    operations = []
+    operands = []
+    inline = None
+    
+    for token in _tokenize(data):
+        if isinstance(token, tuple):
+            # BI ... ID <veri> EI: sözlük belirteçleri ve ham veri birlikte saklanır
+            operations.append((inline + [b'ID', token[1]], b'BI'))
+            inline = None
+            continue
+        
+        if inline is not None:
+            inline.append(minify_number(token))
+        elif token == b'BI':
+            inline = []
+        elif _is_operator(token):
+            operations.append((operands, token))
+            operands = []
+        else:
+            operands.append(minify_number(token))
+    
+    return operations
+
+def minify_number(token: bytes) -> bytes:
+    """Sayıyı en kısa eşdeğer biçimde yaz (1.500 -> 1.5, 0.25 -> .25, -0 -> 0); diğer belirteçler aynen döner"""
+    if not _NUMBER_PATTERN.match(token) or b'.' not in token:
+        return token
+    
+    integer, _, fraction = token.lstrip(b'+-').partition(b'.')
+    integer, fraction = integer.lstrip(b'0'), fraction.rstrip(b'0')
+    if not integer and not fraction:
+        return b'0'
+    sign = b'-' if token[:1] == b'-' else b''
+    return sign + integer + (b'.' + fraction if fraction else b'')
+
+def _append_tokens(output: bytearray, tokens: List[bytes], separator: bytes = b' '):
+    """Belirteçleri yalnızca gereken yerlerde ayraçla ekle (ayraç karakterlerinin çevresinde boşluk gerekmez)"""
+    for token in tokens:
+        if output and output[-1] not in b'()<>[]{}' and token[:1] not in (b'(', b'<', b'[', b'/', b']', b'>'):
+            output += separator
+        output += token
+        separator = b' '
+
+def serialize_content(operations: List[Operation]) -> bytes:
+    """İşlem listesini küçültülmüş içerik akışına yaz (işlemler arasında gerekirse satır sonu)"""
+    output = bytearray()
+    for operands, operator in operations:
+        if operator == b'BI':
+            # Ham görüntü verisinden önce tek boşluk, sonra EI
+            dictionary, image_data = operands[:-2], operands[-1]
+            _append_tokens(output, [b'BI'] + dictionary + [b'ID'], b'\n')
+            output += b' ' + image_data + b'\nEI'
+        else:
+            _append_tokens(output, operands + [operator], b'\n')
+    return bytes(output)
+
+def _multiply(first: Tuple[float, ...], second: Tuple[float, ...]) -> Tuple[float, ...]:
+    """3x3 afin matris çarpımı (a, b, c, d, e, f)"""
+    a, b, c, d, e, f = first
+    A, B, C, D, E, F = second
+    return (a * A + b * C, a * B + b * D, c * A + d * C, c * B + d * D, e * A + f * C + E, e * B + f * D + F)
+
+def _path_points(operands: List[bytes], operator: bytes) -> Optional[List[Tuple[float, float]]]:
+    """Yol operatörünün noktaları (eğrilerde kontrol noktaları dahil; gövde eğriyi kapsar)"""
+    if operator == b'h':
+        return []
+    try:
+        values = [float(token) for token in operands]
+    except ValueError:
+        return None
+    
+    if operator == b're' and len(values) == 4:
+        x, y, width, height = values
+        return [(x, y), (x + width, y + height), (x + width, y), (x, y + height)]
+    if len(values) % 2:
+        return None
+    return list(zip(values[::2], values[1::2]))
+
+def _stroke_extent(line: Dict[str, Optional[float]], ctm: Optional[Tuple[float, ...]]) -> Optional[float]:
+    """Konturun yoldan taşabileceği en büyük uzaklık (sayfa uzayında; çizgi durumu bilinmiyorsa None)"""
+    if line['width'] is None or line['miter'] is None or ctm is None:
+        return None
+    a, b, c, d, _, _ = ctm
+    half_width = line['width'] * max(math.hypot(a, b), math.hypot(c, d)) / 2
+    # Sivri birleşimler ve kare uçlar yarım kalınlığın ötesine taşabilir
+    return half_width * max(line['miter'], math.sqrt(2))
+
+def _path_outside(points: List[Tuple[float, float]], ctm: Optional[Tuple[float, ...]], page_box: Tuple[float, ...],
+                  extent: float = 0.0) -> bool:
+    """Dönüştürülmüş yol sınır kutusu (extent kadar genişletilmiş) sayfa kutusunun tamamen dışında mı"""
+    if not points or ctm is None:
+        return False
+    a, b, c, d, e, f = ctm
+    xs = [x * a + y * c + e for x, y in points]
+    ys = [x * b + y * d + f for x, y in points]
+    x0, y0, x1, y1 = page_box
+    margin = OFFPAGE_MARGIN + extent
+    return (
+        max(xs) < x0 - margin or min(xs) > x1 + margin
+        or max(ys) < y0 - margin or min(ys) > y1 + margin
+    )
+
+def _line_value(operands: List[bytes]) -> Optional[float]:
+    """w / M işlenenini sayıya çevir (okunamazsa None: bilinmeyen durum)"""
+    try:
+        return float(operands[0]) if len(operands) == 1 else None
+    except ValueError:
+        return None
+
+def _path_offpage(points: List[Tuple[float, float]], operator: bytes, ctm: Optional[Tuple[float, ...]],
+                  line: Dict[str, Optional[float]], page_box: Tuple[float, ...]) -> bool:
+    """Boyanan yol sayfada hiçbir iz bırakmıyor mu (konturlarda çizgi kalınlığı hesaba katılır)"""
+    if operator not in PATH_STROKING:
+        return _path_outside(points, ctm, page_box)
+    extent = _stroke_extent(line, ctm)
+    return extent is not None and _path_outside(points, ctm, page_box, extent)
+
+def optimize_content(operations: List[Operation], page_box: Tuple[float, float, float, float]) -> Tuple[List[Operation], Dict[str, int]]:
+    """
+    Görünümü değiştirmeyen sadeleştirmeler: gereksiz durum operatörleri, boyanmayan / sayfa dışı yollar,
+    bitişik metin gösterimlerinin tek TJ'de birleştirilmesi ve boş q / Q çiftleri
+    """
+    stats = {'redundant_state': 0, 'invisible_paths': 0, 'offpage_paths': 0, 'merged_text': 0, 'empty_saves': 0}
+    output = []
+    state, ctm = {}, (1.0, 0.0, 0.0, 1.0, 0.0, 0.0)
+    # Konturların sayfa dışı kontrolü için çizgi kalınlığı ve birleşim sınırı (None: bilinmiyor)
+    line = dict(DEFAULT_LINE)
+    stack = []
+    path, path_points, clipping = [], [], False
+    
+    for operands, operator in operations:
+        # Yol: boyama operatörüne kadar biriktirilir, görünmüyorsa tümden atılır
+        if operator in PATH_CONSTRUCTION or operator in PATH_CLIPPING or (path and operator in PATH_PAINTING):
+            path.append((operands, operator))
+            clipping = clipping or operator in PATH_CLIPPING
+            if path_points is not None and operator in PATH_CONSTRUCTION:
+                points = _path_points(operands, operator)
+                path_points = None if points is None else path_points + points
+            
+            if operator in PATH_PAINTING:
+                if not clipping and operator == b'n':
+                    stats['invisible_paths'] += 1
+                elif not clipping and path_points is not None and _path_offpage(path_points, operator, ctm, line, page_box):
+                    stats['offpage_paths'] += 1
+                else:
+                    output.extend(path)
+                path, path_points, clipping = [], [], False
+            continue
+        
+        if path:
+            # Tamamlanmamış yol (bozuk akış): olduğu gibi bırak
+            output.extend(path)
+            path, path_points, clipping = [], [], False
+        
+        if operator == b'q':
+            stack.append((dict(state), ctm, dict(line)))
+        elif operator == b'Q':
+            if stack:
+                state, ctm, line = stack.pop()
+            else:
+                state = {}
+                line = {'width': None, 'miter': None}
+            if output and output[-1][1] == b'q':
+                output.pop()
+                stats['empty_saves'] += 1
+                continue
+        elif operator == b'cm':
+            if operands == [b'1', b'0', b'0', b'1', b'0', b'0']:
+                stats['redundant_state'] += 1  # Birim matris
+                continue
+            try:
+                ctm = _multiply(tuple(float(token) for token in operands), ctm) if ctm and len(operands) == 6 else None
+            except (ValueError, TypeError):
+                ctm = None  # Okunamayan matris: bu noktadan sonra sayfa dışı kontrolü yapılmaz
+        elif operator in STATE_OPERATORS:
+            if operator == b'w':
+                line['width'] = _line_value(operands)
+            elif operator == b'M':
+                line['miter'] = _line_value(operands)
+            key = STATE_OPERATORS[operator]
+            value = (operator, tuple(operands))
+            if state.get(key) == value:
+                stats['redundant_state'] += 1
+                continue
+            state[key] = value
+        elif operator in STATE_RESETS:
+            for key in STATE_RESETS[operator] or list(state):
+                state.pop(key, None)
+            if operator == b'gs':
+                line = {'width': None, 'miter': None}  # Grafik durumu sözlüğü LW / ML ayarlayabilir
+        elif operator in TEXT_SHOWING and output and output[-1][1] in TEXT_SHOWING:
+            # Arada konumlandırma yoksa Tj / TJ dizisi tek TJ dizisine eşdeğerdir
+            previous = output.pop()[0]
+            elements = (previous[1:-1] if previous[:1] == [b'['] else previous) + \
+                (operands[1:-1] if operands[:1] == [b'['] else operands)
+            output.append(([b'['] + elements + [b']'], b'TJ'))
+            stats['merged_text'] += 1
+            continue
+        
+        output.append((operands, operator))
+    
+    output.extend(path)
+    return output, stats
+
+def normalize_content(data: bytes, page_box: Tuple[float, float, float, float]) -> Tuple[bytes, Dict[str, int]]:
+    """Sayfa içerik akışını ayrıştır, sadeleştir ve küçültülmüş biçimde yeniden yaz"""
+    operations = parse_content(data)
+    optimized, stats = optimize_content(operations, page_box)
+    stats['operators_before'] = len(operations)
+    stats['operators_after'] = len(optimized)
+    return serialize_content(optimized), stats
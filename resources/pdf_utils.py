@@ -6,10 +6,15 @@ Comprehensive PDF processing with modern features
 
 import os
 import io
+import re
+import zlib
+import hashlib
+import collections
 import threading
 from pathlib import Path
 from typing import List, Dict, Any, Optional, Union, Tuple
 import concurrent.futures
+import itertools
 import tempfile
 import shutil
 import time
@@ -24,11 +29,354 @@ try:
     from reportlab.pdfbase.ttfonts import TTFont
     from PIL import Image, ImageDraw, ImageFont
     import fitz  # PyMuPDF
+    from .raster_utils import (encode_pixmap, save_pixmap, crop_pixmap, normalize_pixmap, pixmap_to_array,
+                               classify_pixels, encode_g4_tiff, ccitt_strip, ccitt_image_keys)
+    from .content_utils import normalize_content
     PDF_DEPENDENCIES_AVAILABLE = True
 except ImportError as e:
     print(f"PDF işleme bağımlılıkları eksik: {e}")
     PDF_DEPENDENCIES_AVAILABLE = False
 
+# Görüntü sıkıştırma işçileri süreç havuzunda çalıştığı için modül seviyesinde tutulur;
+# her işçi belgeyi kendisi açar, ana sürece yalnızca yeni akış verisi döner
+
+# Hedef JPEG kalitesinde tahmini piksel başına bit (fotoğraf içerikli RGB; gri için GRAY_BPP_FACTOR ile çarpılır)
+JPEG_BPP_ESTIMATES = {30: 0.8, 50: 1.1, 70: 1.5, 85: 2.3, 95: 4.5}
+GRAY_BPP_FACTOR = 0.55
+# Zaten DCT olan görüntü, hedef tahmininin bu kadar üstünde değilse yeniden kodlanmaz
+DCT_REENCODE_MARGIN = 1.1
+# Bu sınırların altındaki görüntüler (ikon, logo) olduğu gibi bırakılır
+MIN_RECOMPRESS_PIXELS = 64 * 64
+MIN_RECOMPRESS_BYTES = 4096
+# Yeniden kodlamadan kazanç sağlamayan filtreler (kayıplı ya da iki tonlu kodlamalar)
+PASSTHROUGH_FILTERS = ('/JPXDecode', '/CCITTFaxDecode', '/JBIG2Decode')
+# Etkin DPI sınırın bu kadar üstünde değilse yeniden örneklenmez (küçük kazanç, ek bulanıklık)
+DOWNSAMPLE_THRESHOLD = 1.2
+
+_COLORSPACE_COMPONENTS = {'/DeviceGray': 1, '/CalGray': 1, '/DeviceRGB': 3, '/CalRGB': 3, '/Lab': 3, '/DeviceCMYK': 4}
+
+def _image_components(doc, xref: int) -> Optional[int]:
+    """Görüntü sözlüğünden renk bileşeni sayısı (belirlenemezse None; Indexed vb.)"""
+    kind, value = doc.xref_get_key(xref, 'ColorSpace')
+    if kind == 'xref':
+        value = doc.xref_object(int(value.split()[0]), compressed=True)
+    
+    if '/Indexed' in value or '/Separation' in value or '/DeviceN' in value:
+        return None
+    if '/ICCBased' in value:
+        n = doc.xref_get_key(int(value.split('/ICCBased')[1].split()[0]), 'N')[1]
+        return int(n) if n.isdigit() else None
+    for name, components in _COLORSPACE_COMPONENTS.items():
+        if value.startswith(name) or value.startswith(f'[{name}'):
+            return components
+    return None
+
+def _resolve_key(doc, xref: int, key: str) -> str:
+    """Sözlük anahtarının değeri; dolaylı başvuru (ör. /Width 9 0 R) ise başvurulan nesnenin değeri"""
+    kind, value = doc.xref_get_key(xref, key)
+    if kind == 'xref':
+        value = doc.xref_object(int(value.split()[0]), compressed=True).strip()
+    return value
+
+def _image_size(doc, xref: int) -> Optional[Tuple[int, int]]:
+    """Görüntü sözlüğündeki piksel boyutları (okunamazsa None)"""
+    try:
+        return int(_resolve_key(doc, xref, 'Width')), int(_resolve_key(doc, xref, 'Height'))
+    except ValueError:
+        return None
+
+def _estimate_jpeg_bytes(width: int, height: int, components: int, quality: int) -> int:
+    """Verilen kalitede JPEG çıktısının tahmini boyutu (tablo değerleri arasında doğrusal)"""
+    qualities = sorted(JPEG_BPP_ESTIMATES)
+    quality = min(max(quality, qualities[0]), qualities[-1])
+    upper = next(q for q in qualities if q >= quality)
+    lower = max((q for q in qualities if q <= quality), default=upper)
+    
+    bpp = JPEG_BPP_ESTIMATES[lower]
+    if upper != lower:
+        bpp += (JPEG_BPP_ESTIMATES[upper] - bpp) * (quality - lower) / (upper - lower)
+    if components == 1:
+        bpp *= GRAY_BPP_FACTOR
+    
+    return int(width * height * bpp / 8)
+
+def _downsample_size(width: int, height: int, display_size: Tuple[float, float], max_dpi: int) -> Optional[Tuple[int, int]]:
+    """En büyük yerleşime (punto) göre max_dpi'a inen piksel boyutu; yeniden örnekleme gerekmiyorsa None"""
+    display_width, display_height = display_size
+    if not (width and height and display_width and display_height):
+        return None
+    
+    # İki eksen için de sınır korunur, en boy oranı değişmez
+    scale = max(display_width / 72 * max_dpi / width, display_height / 72 * max_dpi / height)
+    if scale * DOWNSAMPLE_THRESHOLD >= 1:
+        return None
+    return max(1, round(width * scale)), max(1, round(height * scale))
+
+def _load_image_pixmap(doc, xref: int, options: Dict[str, Any]):
+    """Görüntüyü çöz; yerleşimine göre küçültülmesi planlandıysa hedef boyuta yeniden örnekle"""
+    pix = fitz.Pixmap(doc, xref)
+    size = options.get('resample_sizes', {}).get(xref)
+    if size:
+        pix = fitz.Pixmap(pix, size[0], size[1], None)
+    return pix
+
+def _passthrough_reason(doc, xref: int, stored_size: int, options: Dict[str, Any]) -> Optional[str]:
+    """
+    Çözmeden yapılan ön kontrol: görüntü yeniden kodlamayla küçülmeyecekse nedenini döndür
+    Yalnızca sözlük anahtarları ve saklanan akış boyutu okunur
+    """
+    if doc.xref_get_key(xref, 'ImageMask')[1] == 'true':
+        return 'mask'  # Maske görüntüleri 1 bit kalmalı
+    
+    size = _image_size(doc, xref)
+    if size is None:
+        return 'unreadable'  # Boyut okunamadı: belge yerine yalnızca bu görüntü olduğu gibi bırakılır
+    width, height = size
+    if width * height < MIN_RECOMPRESS_PIXELS or stored_size < MIN_RECOMPRESS_BYTES:
+        return 'tiny'
+    
+    bits = _resolve_key(doc, xref, 'BitsPerComponent')
+    if bits == '1':
+        return 'bitonal'
+    
+    # Küçültülecek görüntüler tahmin ve filtre kontrollerinde yeni boyutlarıyla değerlendirilir
+    size = options.get('resample_sizes', {}).get(xref)
+    if size:
+        width, height = size
+    
+    filters = doc.xref_get_key(xref, 'Filter')[1]
+    if not size and any(name in filters for name in PASSTHROUGH_FILTERS):
+        return 'already_compressed'
+    
+    components = _image_components(doc, xref)
+    if components is None:
+        return None  # Tahmin yapılamaz; kodlama sonrası boyut kontrolüne bırak
+    if components >= 4:
+        return 'cmyk'  # CMYK renkleri JPEG'e çevrilirken bozulur
+    
+    estimate = _estimate_jpeg_bytes(width, height, components, options['jpeg_quality'])
+    if '/DCTDecode' in filters:
+        # Mevcut bit/piksel hedef kalitenin tahmininden belirgin yüksek değilse kazanç yok
+        if stored_size <= estimate * DCT_REENCODE_MARGIN:
+            return 'already_compressed'
+    elif stored_size <= estimate:
+        return 'no_gain'  # Kayıpsız akış zaten tahmini JPEG'den küçük (çizim, ekran görüntüsü)
+    
+    return None
+
+def _classify_pixmap(pix) -> str:
+    """Renk sınıfı: 'color', 'gray' ya da 'bitonal' (alfasız gri / RGB Pixmap, kopyasız görünüm üzerinde)"""
+    return classify_pixels(pixmap_to_array(pix))
+
+def _encode_ccitt(pix) -> Optional[Tuple[bytes, str]]:
+    """Gri / RGB Pixmap'i eşikleyip CCITT G4 akışı olarak kodla; (şerit verisi, BlackIs1) ya da tek şerit üretilemezse None"""
+    gray_pix = pix if pix.n == 1 else fitz.Pixmap(fitz.csGRAY, pix)
+    return ccitt_strip(encode_g4_tiff(pixmap_to_array(gray_pix) >= 128))
+
+def _encode_image(pix, options: Dict[str, Any]) -> Dict[str, Any]:
+    """Pixmap'i renk sınıfına göre kodla: renkli -> RGB JPEG, gri -> tek kanal JPEG, siyah-beyaz -> CCITT G4"""
+    pix = normalize_pixmap(pix)
+    width, height = pix.width, pix.height
+    
+    kind = 'gray' if pix.n == 1 else 'color'
+    if options.get('color_analysis'):
+        kind = _classify_pixmap(pix)
+    
+    if kind == 'bitonal':
+        ccitt = _encode_ccitt(pix)
+        if ccitt is not None:
+            data, black_is_1 = ccitt
+            return {
+                'action': 'ccitt',
+                'data': data,
+                'conversion': 'bitonal',
+                'keys': dict(ccitt_image_keys(width, height, black_is_1), Decode='null')
+            }
+        kind = 'gray'
+    
+    conversion = None
+    if kind == 'gray' and pix.n == 3:
+        pix = fitz.Pixmap(fitz.csGRAY, pix)
+        conversion = 'gray'
+    
+    # JPEG olarak sıkıştır (Pillow'a aktarmadan, doğrudan Pixmap'ten)
+    return {
+        'action': 'jpeg',
+        'data': encode_pixmap(pix, 'jpeg', options['jpeg_quality']),
+        'conversion': conversion,
+        'keys': {
+            'Filter': '/DCTDecode',
+            'DecodeParms': 'null',
+            'Decode': 'null',
+            'ColorSpace': '/DeviceGray' if pix.n == 1 else '/DeviceRGB',
+            'BitsPerComponent': '8',
+            'Width': str(width),
+            'Height': str(height)
+        }
+    }
+
+def _recompress_image(doc, xref: int, options: Dict[str, Any]) -> Dict[str, Any]:
+    """Tek görüntüyü yeniden kodla; yazılacak akışı ve sözlük anahtarlarını döndür"""
+    stored_size = len(doc.xref_stream_raw(xref))
+    
+    reason = _passthrough_reason(doc, xref, stored_size, options)
+    # Kayıpsız akış tahmini JPEG'den küçük olsa da siyah-beyaz ise CCITT G4 daha küçük olabilir
+    bitonal_only = reason == 'no_gain' and options.get('color_analysis')
+    if reason and not bitonal_only:
+        return {'xref': xref, 'action': 'passthrough', 'reason': reason}
+    
+    pix = _load_image_pixmap(doc, xref, options)
+    if pix.n - pix.alpha >= 4:
+        return {'xref': xref, 'action': 'passthrough', 'reason': 'cmyk'}
+    if bitonal_only and _classify_pixmap(normalize_pixmap(pix)) != 'bitonal':
+        return {'xref': xref, 'action': 'passthrough', 'reason': 'no_gain'}
+    
+    result = _encode_image(pix, options)
+    pix = None
+    
+    # Tahmin tutmadıysa özgün akış baytları korunur
+    if len(result['data']) >= stored_size:
+        return {'xref': xref, 'action': 'passthrough', 'reason': 'no_gain'}
+    
+    # Renk anahtarı maskesi (/Mask dizisi) özgün renk uzayı ve bit derinliğiyle yazılmıştır;
+    # bileşen sayısı ya da bit derinliği değiştiyse geçersizdir (bazı görüntüleyicilerde görüntü kaybolur)
+    if doc.xref_get_key(xref, 'Mask')[0] == 'array':
+        components = 1 if result['keys']['ColorSpace'] == '/DeviceGray' else 3
+        if result['conversion'] or _image_components(doc, xref) != components:
+            result['keys']['Mask'] = 'null'
+    
+    result.update({'xref': xref, 'downsampled': xref in options.get('resample_sizes', {})})
+    return result
+
+def _recompress_image_chunk(source, xrefs: List[int], options: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Bir grup görüntüyü yeniden kodla (source: açık belge ya da işçide açılacak dosya yolu)"""
+    doc = fitz.open(source) if isinstance(source, str) else source
+    
+    try:
+        results = []
+        for xref in xrefs:
+            try:
+                results.append(_recompress_image(doc, xref, options))
+            except Exception as e:
+                results.append({'xref': xref, 'action': 'error', 'error': str(e)})
+        return results
+    
+    finally:
+        if doc is not source:
+            doc.close()
+
+# Hedef boyut modu: kalite bu seviyeler arasında ikili aramayla seçilir
+TARGET_QUALITY_LEVELS = (20, 30, 40, 50, 60, 70, 80, 90)
+# Tahmin için kodlanan örnek görüntü sayısı ve her örnekten alınan kesitin en büyük kenarı
+TARGET_SAMPLE_IMAGES = 12
+SAMPLE_TILE_EDGE = 1024
+
+def _select_image_sample(stored_sizes: Dict[int, int], count: int = TARGET_SAMPLE_IMAGES) -> List[int]:
+    """Saklanan boyuta göre sıralı görüntülerden eşit aralıklı örnek (büyük ve küçükler birlikte temsil edilir)"""
+    ordered = sorted(stored_sizes, key=stored_sizes.get, reverse=True)
+    if len(ordered) <= count:
+        return ordered
+    return [ordered[round(i * (len(ordered) - 1) / (count - 1))] for i in range(count)]
+
+def _sample_tile(doc, xref: int, options: Dict[str, Any]):
+    """Tahmin kodlaması için görüntünün (küçültülmüş hâlinin) merkez kesiti ve tam piksel sayısı (CMYK için None)"""
+    pix = _load_image_pixmap(doc, xref, options)
+    if pix.n - pix.alpha >= 4:
+        return None
+    return crop_pixmap(pix, SAMPLE_TILE_EDGE, SAMPLE_TILE_EDGE), pix.width * pix.height
+
+def _predict_image_size(doc, xref: int, stored_size: int, options: Dict[str, Any], sample) -> int:
+    """Görüntünün verilen seçeneklerle çıktıya yazılacak tahmini boyutu (kesitin bit/pikseli tam görüntüye ölçeklenir)"""
+    reason = _passthrough_reason(doc, xref, stored_size, options)
+    # _recompress_image ile aynı karar: kazançsız kayıpsız akış yalnızca siyah-beyazsa yeniden kodlanır
+    bitonal_only = reason == 'no_gain' and options.get('color_analysis')
+    if sample is None or (reason and not bitonal_only):
+        return stored_size
+    
+    tile, pixels = sample
+    result = _encode_image(tile, options)
+    if bitonal_only and result['conversion'] != 'bitonal':
+        return stored_size
+    
+    encoded = len(result['data']) * pixels / (tile.width * tile.height)
+    return min(stored_size, int(encoded))
+
+# Nesne tekilleştirme: yazı tipleri, görüntüler ve ICC profilleri içerikleri üzerinden karşılaştırılır
+DEDUP_MAX_ROUNDS = 4
+# Akış içeriği hash'ine girmeyen, yalnızca kodlamayı tanımlayan sözlük anahtarları
+STREAM_ENCODING_KEYS = {'Length', 'Filter', 'DecodeParms', 'DL'}
+FONT_FILE_KEYS = ('FontFile', 'FontFile2', 'FontFile3')
+_REFERENCE_PATTERN = re.compile(r'\b(\d+) 0 R\b')
+_ICC_REFERENCE_PATTERN = re.compile(r'/ICCBased\s+(\d+) 0 R')
+# Alt küme yazı tipi etiketi (ABCDEF+Ad): her belgede rastgeledir, aynı glif kümesini ayırt etmez
+_SUBSET_TAG_PATTERN = re.compile(r'/[A-Z]{6}\+')
+
+def _remap_references(text: str, mapping: Dict[int, int]) -> str:
+    """Nesne metnindeki dolaylı başvuruları tekilleştirme eşlemesine göre yeniden yaz"""
+    return _REFERENCE_PATTERN.sub(lambda m: f"{mapping.get(int(m.group(1)), int(m.group(1)))} 0 R", text)
+
+def _classify_shared_objects(doc) -> Dict[int, str]:
+    """Tekilleştirilebilir nesneler: xref -> 'font', 'image' ya da 'icc' (sayfa, anotasyon vb. dokunulmaz)"""
+    kinds = {}
+    for xref in range(1, doc.xref_length()):
+        text = doc.xref_object(xref, compressed=True)
+        
+        for match in _ICC_REFERENCE_PATTERN.finditer(text):
+            kinds[int(match.group(1))] = 'icc'
+        if text.startswith('[/ICCBased'):
+            kinds[xref] = 'icc'
+            continue
+        
+        if doc.xref_is_stream(xref):
+            if doc.xref_get_key(xref, 'Subtype')[1] == '/Image':
+                kinds[xref] = 'image'
+            continue
+        
+        object_type = doc.xref_get_key(xref, 'Type')[1]
+        if object_type not in ('/Font', '/FontDescriptor'):
+            continue
+        
+        # Yazı tipi programı ve ToUnicode akışları sözlükleriyle birlikte tekilleştirilir
+        kinds[xref] = 'font'
+        for key in FONT_FILE_KEYS + ('ToUnicode',):
+            kind, value = doc.xref_get_key(xref, key)
+            if kind == 'xref':
+                kinds[int(value.split()[0])] = 'font'
+    
+    return kinds
+
+def _stream_content_hash(doc, xref: int, kind: str) -> str:
+    """Akışın kodlamadan bağımsız içerik hash'i: görüntülerde çözülmüş pikseller, diğerlerinde açılmış veri"""
+    digest = hashlib.blake2b(digest_size=20)
+    
+    if kind == 'image' and doc.xref_get_key(xref, 'ImageMask')[1] != 'true':
+        try:
+            pix = fitz.Pixmap(doc, xref)
+            digest.update(f"{pix.width}x{pix.height}x{pix.n}:".encode())
+            digest.update(pix.samples_mv)
+            return digest.hexdigest()
+        except Exception:
+            pass  # Çözülemeyen görüntü: açılmış akış verisi karşılaştırılır
+    
+    digest.update(doc.xref_stream(xref) or b'')
+    return digest.hexdigest()
+
+def _object_fingerprint(doc, xref: int, kind: str, mapping: Dict[int, int], content_hashes: Dict[int, str]) -> str:
+    """Nesnenin başvurular eşlendikten sonraki kanonik biçimi (aynı parmak izi = aynı nesne)"""
+    if not doc.xref_is_stream(xref):
+        text = _remap_references(doc.xref_object(xref, compressed=True), mapping)
+        # Yazı tipleri program + genişlikler + kodlama (glif kümesi) ile eşleşir, alt küme etiketiyle değil
+        return _SUBSET_TAG_PATTERN.sub('/', text) if kind == 'font' else text
+    
+    if xref not in content_hashes:
+        content_hashes[xref] = _stream_content_hash(doc, xref, kind)
+    
+    entries = [
+        f"/{key} {_remap_references(doc.xref_get_key(xref, key)[1], mapping)}"
+        for key in sorted(doc.xref_get_keys(xref)) if key not in STREAM_ENCODING_KEYS
+    ]
+    return ''.join(entries) + content_hashes[xref]
+
 class PDFProcessor:
     """
     Gelişmiş PDF işleme sınıfı
@@ -68,6 +416,7 @@ class PDFProcessor:
             # Ayarları al
             order = kwargs.get('order', 'filename')
             add_bookmarks = kwargs.get('add_bookmarks', True)
+            deduplicate = kwargs.get('deduplicate', True)
             
             # Dosyaları sırala
             sorted_files = self._sort_files(input_files, order)
@@ -98,8 +447,19 @@ class PDFProcessor:
             output_filename = "merged_document.pdf"
             output_path = output_dir / output_filename
             
-            with open(output_path, 'wb') as output_file:
-                merger.write(output_file)
+            dedup_stats = {}
+            if deduplicate:
+                # Her kaynak kendi yazı tipi / logo / ICC kopyasını getirir; yazmadan önce tekilleştir
+                buffer = io.BytesIO()
+                merger.write(buffer)
+                doc = fitz.open(stream=buffer.getvalue(), filetype='pdf')
+                buffer = None
+                dedup_stats = self._deduplicate_objects(doc)
+                doc.save(str(output_path), garbage=4, deflate=True)
+                doc.close()
+            else:
+                with open(output_path, 'wb') as output_file:
+                    merger.write(output_file)
             
             end_time = time.time()
             self.stats['processed_files'] += len(input_files)
@@ -111,7 +471,8 @@ class PDFProcessor:
                 'pages_merged': len(merger.pages),
                 'files_processed': len(sorted_files),
                 'output_size': output_path.stat().st_size,
-                'processing_time': end_time - start_time
+                'processing_time': end_time - start_time,
+                **dedup_stats
             }
             
         except Exception as e:
@@ -201,35 +562,51 @@ class PDFProcessor:
             quality = kwargs.get('quality', 'medium')
             optimize_images = kwargs.get('optimize_images', True)
             remove_metadata = kwargs.get('remove_metadata', False)
+            target_size = kwargs.get('target_size')  # Bayt; verilirse JPEG kalitesi bu boyuta sığacak şekilde seçilir
             
             # PyMuPDF ile sıkıştırma
             doc = fitz.open(input_file)
             
-            # Sıkıştırma seviyeleri
+            # Sıkıştırma seviyeleri ('dpi': max_dpi=True verildiğinde kullanılan etkin DPI sınırı)
             quality_settings = {
-                'low': {'deflate': 9, 'jpeg': 30},
-                'medium': {'deflate': 6, 'jpeg': 50},
-                'high': {'deflate': 3, 'jpeg': 70}
+                'low': {'deflate': 9, 'jpeg': 30, 'dpi': 100},
+                'medium': {'deflate': 6, 'jpeg': 50, 'dpi': 150},
+                'high': {'deflate': 3, 'jpeg': 70, 'dpi': 220}
             }
             
             settings = quality_settings.get(quality, quality_settings['medium'])
+            # Etkin DPI sınırı isteğe bağlıdır (varsayılan None: çözünürlük korunur);
+            # True verilirse kalite seviyesinin DPI değeri kullanılır
+            max_dpi = kwargs.get('max_dpi')
+            if max_dpi is True:
+                max_dpi = settings['dpi']
+            # Renkli kaydedilmiş gri / siyah-beyaz görüntüleri tek kanal JPEG'e ya da CCITT G4'e çevir
+            convert_colors = kwargs.get('convert_colors', True)
+            
+            image_stats = {
+                'images_referenced': 0, 'images_unique': 0, 'images_recompressed': 0,
+                'images_passed_through': 0, 'images_downsampled': 0,
+                'images_converted_gray': 0, 'images_converted_bitonal': 0, 'passthrough_reasons': {}
+            }
+            target_stats = {}
             
             if optimize_images:
-                # Resimleri sıkıştır
-                for page_num in range(len(doc)):
-                    page = doc[page_num]
-                    image_list = page.get_images()
-                    
-                    for img_index, img in enumerate(image_list):
-                        xref = img[0]
-                        pix = fitz.Pixmap(doc, xref)
-                        
-                        if pix.n - pix.alpha < 4:  # RGB veya GRAY
-                            # JPEG olarak sıkıştır
-                            img_data = pix.pil_tobytes(format="JPEG", optimize=True, quality=settings['jpeg'])
-                            doc.update_object(xref, img_data)
-                        
-                        pix = None
+                # Görüntüler xref başına bir kez toplanır (her sayfadaki logo tek kez çözülür ve kodlanır)
+                references = self._collect_image_xrefs(doc)
+                image_stats['images_referenced'] = sum(references.values())
+                image_stats['images_unique'] = len(references)
+                
+                options = {'jpeg_quality': settings['jpeg'], 'color_analysis': convert_colors}
+                if max_dpi:
+                    # Görüntüler sayfadaki en büyük yerleşimlerine göre küçültülür
+                    options['resample_sizes'] = self._plan_downsampling(doc, max_dpi)
+                
+                if target_size:
+                    # Örnek görüntülerle tahmin; belge yalnızca seçilen kalitede bir kez kodlanır ve kaydedilir
+                    target_stats = self._search_quality(doc, input_path, list(references), target_size, options)
+                    options['jpeg_quality'] = target_stats['jpeg_quality']
+                
+                image_stats.update(self._recompress_images(doc, input_file, list(references), options))
             
             if remove_metadata:
                 # Metadata'yı temizle
@@ -248,6 +625,15 @@ class PDFProcessor:
             compressed_size = output_path.stat().st_size
             compression_ratio = (1 - compressed_size / original_size) * 100
             
+            if target_size:
+                target_stats['target_size'] = target_size
+                target_stats['target_met'] = compressed_size <= target_size
+                if target_stats.get('predicted_size'):
+                    # Tahminin gerçek çıktıdan sapması (%)
+                    target_stats['prediction_error'] = (compressed_size - target_stats['predicted_size']) / target_stats['predicted_size'] * 100
+                if not target_stats['target_met']:
+                    self.log(f"Hedef boyuta ulaşılamadı: {compressed_size} > {target_size} bayt", "warning")
+            
             end_time = time.time()
             self.stats['processed_files'] += 1
             self.stats['total_processing_time'] += (end_time - start_time)
@@ -258,7 +644,9 @@ class PDFProcessor:
                 'original_size': original_size,
                 'compressed_size': compressed_size,
                 'compression_ratio': compression_ratio,
-                'processing_time': end_time - start_time
+                'processing_time': end_time - start_time,
+                **image_stats,
+                **target_stats
             }
             
         except Exception as e:
@@ -266,6 +654,138 @@ class PDFProcessor:
             self.log(f"PDF sıkıştırma hatası: {e}", "error")
             return {'success': False, 'error': str(e)}
     
+    def _collect_image_xrefs(self, doc) -> Dict[int, int]:
+        """Belgedeki görüntüleri xref başına topla (xref -> sayfalardaki kullanım sayısı)"""
+        references = {}
+        for page in doc:
+            for img in page.get_images():
+                references[img[0]] = references.get(img[0], 0) + 1
+        return references
+    
+    def _collect_image_placements(self, doc) -> Dict[int, Tuple[float, float]]:
+        """Her görüntünün sayfalardaki en büyük çizim boyutu (punto; döndürülmüş yerleşimler dahil)"""
+        placements = {}
+        for page in doc:
+            for img in page.get_images():
+                width, height = placements.get(img[0], (0.0, 0.0))
+                for rect, matrix in page.get_image_rects(img[0], transform=True):
+                    # Matris birim kareyi sayfaya taşır; eksen uzunlukları çizim boyutudur
+                    width = max(width, abs(complex(matrix.a, matrix.b)))
+                    height = max(height, abs(complex(matrix.c, matrix.d)))
+                placements[img[0]] = (width, height)
+        return placements
+    
+    def _plan_downsampling(self, doc, max_dpi: int) -> Dict[int, Tuple[int, int]]:
+        """Etkin DPI'ı sınırı aşan görüntüler için hedef piksel boyutları (xref -> (genişlik, yükseklik))"""
+        sizes = {}
+        for xref, display_size in self._collect_image_placements(doc).items():
+            image_size = _image_size(doc, xref)
+            if image_size is None:
+                continue
+            size = _downsample_size(*image_size, display_size, max_dpi)
+            if size:
+                sizes[xref] = size
+        
+        if sizes:
+            self.log(f"{len(sizes)} görüntü {max_dpi} DPI sınırına göre küçültülecek", "info")
+        return sizes
+    
+    def _search_quality(self, doc, input_path: Path, xrefs: List[int], target_size: int,
+                        options: Dict[str, Any]) -> Dict[str, Any]:
+        """Tahmini çıktı boyutu hedefe sığan en yüksek JPEG kalitesini ikili aramayla bul"""
+        stored_sizes = {xref: len(doc.xref_stream_raw(xref)) for xref in xrefs}
+        # Görüntü dışı içerik (metin, yazı tipleri, yapı) kaliteden bağımsız kabul edilir
+        base_size = max(0, input_path.stat().st_size - sum(stored_sizes.values()))
+        
+        sample = _select_image_sample(stored_sizes)
+        tiles = {xref: _sample_tile(doc, xref, options) for xref in sample}
+        sampled_stored = sum(stored_sizes[xref] for xref in sample)
+        unsampled_stored = sum(stored_sizes.values()) - sampled_stored
+        
+        predictions = {}
+        
+        def predict(quality: int) -> int:
+            if quality not in predictions:
+                probe = {**options, 'jpeg_quality': quality}
+                sampled = sum(
+                    _predict_image_size(doc, xref, stored_sizes[xref], probe, tiles[xref]) for xref in sample
+                )
+                # Örneklenmeyen görüntüler örneğin boyut oranıyla tahmin edilir
+                ratio = sampled / sampled_stored if sampled_stored else 1.0
+                predictions[quality] = base_size + sampled + int(unsampled_stored * ratio)
+            return predictions[quality]
+        
+        levels = TARGET_QUALITY_LEVELS
+        low, high, best = 0, len(levels) - 1, 0
+        while low <= high:
+            middle = (low + high) // 2
+            if predict(levels[middle]) <= target_size:
+                best, low = middle, middle + 1
+            else:
+                high = middle - 1
+        
+        tiles.clear()
+        quality = levels[best]
+        self.log(
+            f"Hedef boyut {target_size} bayt: JPEG kalitesi {quality} "
+            f"(tahmin {predict(quality)} bayt, {len(sample)} örnek görüntü, {len(predictions)} deneme)", "info"
+        )
+        
+        return {
+            'jpeg_quality': quality,
+            'predicted_size': predict(quality),
+            'quality_probes': len(predictions),
+            'sampled_images': len(sample)
+        }
+    
+    def _recompress_images(self, doc, input_file: str, xrefs: List[int], options: Dict[str, Any]) -> Dict[str, Any]:
+        """Benzersiz görüntüleri işçi havuzunda yeniden kodla, her sonucu belgeye bir kez yaz"""
+        workers = min(self.max_workers, len(xrefs))
+        
+        if workers <= 1:
+            results = _recompress_image_chunk(doc, xrefs, options)
+        else:
+            # Küçük gruplar: büyük ve küçük görüntüler işçiler arasında dengelenir
+            chunk_size = max(1, -(-len(xrefs) // (workers * 4)))
+            chunks = [xrefs[i:i + chunk_size] for i in range(0, len(xrefs), chunk_size)]
+            
+            with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+                results = list(itertools.chain.from_iterable(pool.map(
+                    _recompress_image_chunk, itertools.repeat(str(input_file)), chunks, itertools.repeat(options)
+                )))
+        
+        recompressed = downsampled = 0
+        conversions = {'gray': 0, 'bitonal': 0}
+        passthrough_reasons = {}
+        for result in results:
+            if result['action'] == 'error':
+                self.log(f"Görüntü sıkıştırma hatası (xref {result['xref']}): {result['error']}", "warning")
+            elif result['action'] == 'passthrough':
+                # Özgün akışa dokunulmaz
+                passthrough_reasons[result['reason']] = passthrough_reasons.get(result['reason'], 0) + 1
+            else:
+                self._write_image_stream(doc, result['xref'], result['data'], result['keys'])
+                recompressed += 1
+                downsampled += result['downsampled']
+                if result['conversion']:
+                    conversions[result['conversion']] += 1
+        
+        return {
+            'images_recompressed': recompressed,
+            'images_downsampled': downsampled,
+            'images_converted_gray': conversions['gray'],
+            'images_converted_bitonal': conversions['bitonal'],
+            'images_passed_through': sum(passthrough_reasons.values()),
+            'passthrough_reasons': passthrough_reasons
+        }
+    
+    def _write_image_stream(self, doc, xref: int, data: bytes, keys: Dict[str, str]):
+        """Görüntü akışını yeni veriyle değiştir, sözlüğü yeni veriye göre güncelle"""
+        # update_stream sıkıştırılmamış veri varsayar; filtre anahtarları sonradan yazılır
+        doc.update_stream(xref, data, compress=False)
+        for key, value in keys.items():
+            doc.xref_set_key(xref, key, value)
+    
     def convert_pdf(self, input_file: str, output_dir: str, **kwargs) -> Dict[str, Any]:
         """PDF'i diğer formatlara dönüştür"""
         try:
@@ -292,35 +812,29 @@ class PDFProcessor:
     def _convert_pdf_to_images(self, input_file: str, output_dir: Path, format: str, dpi: int) -> Dict[str, Any]:
         """PDF'i görüntülere dönüştür"""
         try:
-            import pdf2image
-            
             input_path = Path(input_file)
-            
-            # PDF'i görüntülere çevir
-            pages = pdf2image.convert_from_path(
-                input_file,
-                dpi=dpi,
-                fmt=format.upper()
-            )
-            
             output_files = []
-            for i, page in enumerate(pages):
-                output_filename = f"{input_path.stem}_page_{i+1}.{format}"
-                output_path = output_dir / output_filename
-                
-                page.save(output_path, format.upper())
-                output_files.append(str(output_path))
+            
+            # Sayfalar tek tek render edilir, Pixmap doğrudan kodlanır (Pillow kopyası yalnızca TIFF için)
+            with fitz.open(input_file) as doc:
+                for i, page in enumerate(doc):
+                    output_filename = f"{input_path.stem}_page_{i+1}.{format}"
+                    output_path = output_dir / output_filename
+                    
+                    pix = page.get_pixmap(dpi=dpi, alpha=False)
+                    save_pixmap(pix, output_path, format)
+                    pix = None
+                    
+                    output_files.append(str(output_path))
             
             return {
                 'success': True,
                 'output_files': output_files,
-                'pages_converted': len(pages),
+                'pages_converted': len(output_files),
                 'format': format,
                 'dpi': dpi
             }
             
-        except ImportError:
-            return {'success': False, 'error': 'pdf2image modülü bulunamadı'}
         except Exception as e:
             return {'success': False, 'error': str(e)}
     
@@ -704,12 +1218,12 @@ class PDFProcessor:
                         xref = img[0]
                         pix = fitz.Pixmap(doc, xref)
                         
-                        if pix.n - pix.alpha < 4:  # RGB veya GRAY
-                            output_filename = f"{input_path.stem}_page{page_num+1}_img{img_index+1}.png"
-                            output_path = output_dir / output_filename
-                            
-                            pix.save(str(output_path))
-                            extracted_images.append(str(output_path))
+                        # CMYK ve diğer renk uzayları PNG için RGB'ye çevrilir
+                        output_filename = f"{input_path.stem}_page{page_num+1}_img{img_index+1}.png"
+                        output_path = output_dir / output_filename
+                        
+                        save_pixmap(pix, output_path, 'png')
+                        extracted_images.append(str(output_path))
                         
                         pix = None
                         
@@ -717,6 +1231,7 @@ class PDFProcessor:
                         self.log(f"Resim çıkarma hatası (sayfa {page_num+1}, resim {img_index+1}): {e}", "warning")
                         continue
             
+            page_count = len(doc)
             doc.close()
             
             end_time = time.time()
@@ -727,7 +1242,7 @@ class PDFProcessor:
                 'success': True,
                 'extracted_images': extracted_images,
                 'images_count': len(extracted_images),
-                'pages_processed': len(doc),
+                'pages_processed': page_count,
                 'processing_time': end_time - start_time
             }
             
@@ -744,11 +1259,22 @@ class PDFProcessor:
             output_dir = Path(output_dir)
             output_dir.mkdir(parents=True, exist_ok=True)
             
+            deduplicate = kwargs.get('deduplicate', True)
+            # Derin geçiş: içerik akışlarını ayrıştır, sadeleştir ve verilen zlib seviyesiyle sıkıştır
+            normalize = kwargs.get('normalize_content', False)
+            zlib_level = kwargs.get('zlib_level', 9)
+            measure_timing = kwargs.get('measure_timing', normalize)
+            
             doc = fitz.open(input_file)
+            timing_before = self._measure_page_timing(doc) if measure_timing else None
             
             # Optimize işlemleri
             doc.scrub()  # Gereksiz objeleri temizle
             
+            # İçerik bazlı tekilleştirme (garbage=4 yalnızca bayt bayt aynı nesneleri birleştirir)
+            dedup_stats = self._deduplicate_objects(doc) if deduplicate else {}
+            content_stats = self._normalize_contents(doc, zlib_level) if normalize else {}
+            
             output_filename = f"{input_path.stem}_optimized.pdf"
             output_path = output_dir / output_filename
             
@@ -756,9 +1282,14 @@ class PDFProcessor:
             doc.save(str(output_path), 
                     garbage=4,  # Garbage collection
                     deflate=True,  # Compression
-                    clean=True)  # Clean up
+                    clean=not normalize)  # Clean up (normalize açıksa akışlar zaten yeniden yazıldı)
             doc.close()
             
+            if measure_timing:
+                # Sayfa başına ayrıştırma / çizim süresi: özgün belge ve kaydedilen çıktı
+                with fitz.open(str(output_path)) as optimized:
+                    content_stats.update(self._compare_page_timing(timing_before, self._measure_page_timing(optimized)))
+            
             # Boyut karşılaştırması
             original_size = input_path.stat().st_size
             optimized_size = output_path.stat().st_size
@@ -774,7 +1305,9 @@ class PDFProcessor:
                 'original_size': original_size,
                 'optimized_size': optimized_size,
                 'size_reduction': size_reduction,
-                'processing_time': end_time - start_time
+                'processing_time': end_time - start_time,
+                **dedup_stats,
+                **content_stats
             }
             
         except Exception as e:
@@ -782,6 +1315,172 @@ class PDFProcessor:
             self.log(f"PDF optimizasyon hatası: {e}", "error")
             return {'success': False, 'error': str(e)}
     
+    def _deduplicate_objects(self, doc) -> Dict[str, Any]:
+        """
+        Aynı içerikli yazı tipi, görüntü ve ICC profili nesnelerini tek nesnede birleştir
+        Başvurular kanonik nesneye yönlendirilir; kopyalar kayıtta garbage ile düşer
+        """
+        kinds = _classify_shared_objects(doc)
+        
+        # Boyutu eşsiz görüntülerin kopyası olamaz; pikselleri hiç çözülmez
+        image_shapes = {
+            xref: tuple(doc.xref_get_key(xref, key)[1] for key in ('Width', 'Height', 'BitsPerComponent'))
+            for xref, kind in kinds.items() if kind == 'image'
+        }
+        shape_counts = collections.Counter(image_shapes.values())
+        for xref, shape in image_shapes.items():
+            if shape_counts[shape] == 1:
+                del kinds[xref]
+        
+        mapping, content_hashes = {}, {}
+        by_kind = {'font': 0, 'image': 0, 'icc': 0}
+        bytes_saved = 0
+        
+        # Alt nesneler birleştikçe üst nesneler (yazı tipi tanımlayıcısı -> yazı tipi) de eşitlenir
+        for _ in range(DEDUP_MAX_ROUNDS):
+            seen = {}
+            merged = 0
+            for xref, kind in kinds.items():
+                if xref in mapping:
+                    continue
+                
+                fingerprint = (kind, _object_fingerprint(doc, xref, kind, mapping, content_hashes))
+                canonical = seen.setdefault(fingerprint, xref)
+                if canonical != xref:
+                    mapping[xref] = canonical
+                    by_kind[kind] += 1
+                    merged += 1
+                    if doc.xref_is_stream(xref):
+                        bytes_saved += len(doc.xref_stream_raw(xref) or b'')
+                    bytes_saved += len(doc.xref_object(xref, compressed=True))
+            
+            if not merged:
+                break
+        
+        if mapping:
+            self._redirect_references(doc, mapping)
+            self.log(f"Tekilleştirme: {len(mapping)} nesne birleştirildi, {bytes_saved} bayt kazanç", "info")
+        
+        return {
+            'objects_deduplicated': len(mapping),
+            'dedup_by_kind': by_kind,
+            'dedup_bytes_saved': bytes_saved
+        }
+    
+    def _redirect_references(self, doc, mapping: Dict[int, int]):
+        """Tüm nesnelerdeki başvuruları kanonik nesnelere çevir"""
+        for xref in range(1, doc.xref_length()):
+            if xref in mapping:
+                continue
+            
+            if not doc.xref_is_stream(xref):
+                text = doc.xref_object(xref, compressed=True)
+                remapped = _remap_references(text, mapping)
+                if remapped != text:
+                    doc.update_object(xref, remapped)
+                continue
+            
+            # update_object akışı siler; akışlı nesnelerde yalnızca değişen anahtarlar yazılır
+            for key in doc.xref_get_keys(xref):
+                value = doc.xref_get_key(xref, key)[1]
+                remapped = _remap_references(value, mapping)
+                if remapped != value:
+                    doc.xref_set_key(xref, key, remapped)
+    
+    def _normalize_contents(self, doc, zlib_level: int) -> Dict[str, Any]:
+        """Sayfa içerik akışlarını tek akışta birleştir, sadeleştir ve küçültülmüş olarak yeni bir akışa yaz"""
+        optimizations = collections.Counter()
+        bytes_before = bytes_after = pages_normalized = 0
+        # (içerik akışları, sayfa kutusu) -> yeni akış; aynı içeriği paylaşan sayfalar yeni akışı da paylaşır
+        normalized_xrefs = {}
+        
+        for page in doc:
+            xrefs = tuple(page.get_contents())
+            if not xrefs:
+                continue
+            
+            key = (xrefs, tuple(page.mediabox))
+            if key in normalized_xrefs:
+                page.set_contents(normalized_xrefs[key])
+                continue
+            
+            data = b'\n'.join(doc.xref_stream(xref) or b'' for xref in xrefs)
+            try:
+                normalized, stats = normalize_content(data, tuple(page.mediabox))
+            except Exception as e:
+                self.log(f"İçerik akışı ayrıştırılamadı (sayfa {page.number + 1}): {e}", "warning")
+                continue
+            
+            # Özgün akışlar yerinde değiştirilmez: ilk akışı (ortak başlık vb.) başka sayfalar da
+            # kullanıyor olabilir; kullanılmayan eski akışlar kayıtta garbage ile düşer
+            new_xref = doc.get_new_xref()
+            doc.update_object(new_xref, "<<>>")
+            # update_stream sıkıştırılmamış veri varsayar; filtre anahtarı sonradan yazılır
+            doc.update_stream(new_xref, zlib.compress(normalized, zlib_level), compress=False)
+            doc.xref_set_key(new_xref, 'Filter', '/FlateDecode')
+            page.set_contents(new_xref)
+            normalized_xrefs[key] = new_xref
+            
+            optimizations.update(stats)
+            bytes_before += len(data)
+            bytes_after += len(normalized)
+            pages_normalized += 1
+        
+        operators_removed = optimizations.pop('operators_before', 0) - optimizations.pop('operators_after', 0)
+        self.log(
+            f"İçerik akışları: {pages_normalized} sayfa, {bytes_before} -> {bytes_after} bayt, "
+            f"{operators_removed} operatör kaldırıldı", "info"
+        )
+        
+        return {
+            'pages_normalized': pages_normalized,
+            'content_bytes_before': bytes_before,
+            'content_bytes_after': bytes_after,
+            'content_operators_removed': operators_removed,
+            'content_optimizations': dict(optimizations)
+        }
+    
+    def _measure_page_timing(self, doc) -> List[Dict[str, float]]:
+        """
+        Her sayfa için içerik ayrıştırma (görüntüleme listesi) ve çizim süresi (saniye)
+        Sayfa önce bir kez çizilir: yazı tipi / glif önbelleği iki ölçümde de sıcak olur, önce / sonra karşılaştırılabilir
+        """
+        timings = []
+        for page in doc:
+            page.get_displaylist().get_pixmap(alpha=False)
+            
+            start = time.perf_counter()
+            display_list = page.get_displaylist()
+            parsed = time.perf_counter()
+            display_list.get_pixmap(alpha=False)
+            timings.append({'parse': parsed - start, 'render': time.perf_counter() - parsed})
+        return timings
+    
+    def _compare_page_timing(self, before: List[Dict[str, float]], after: List[Dict[str, float]]) -> Dict[str, Any]:
+        """Önce / sonra sayfa sürelerini eşleştir ve toplamları çıkar"""
+        pages = [
+            {
+                'page': number,
+                'parse_before': old['parse'], 'parse_after': new['parse'],
+                'render_before': old['render'], 'render_after': new['render']
+            }
+            for number, (old, new) in enumerate(zip(before, after), 1)
+        ]
+        
+        totals = {
+            'parse_time_before': sum(page['parse_before'] for page in pages),
+            'parse_time_after': sum(page['parse_after'] for page in pages),
+            'render_time_before': sum(page['render_before'] for page in pages),
+            'render_time_after': sum(page['render_after'] for page in pages)
+        }
+        
+        # Ayrıştırma + çizim toplamı üzerinden hızlanma oranı (1'den büyükse çıktı daha hızlı)
+        after = totals['parse_time_after'] + totals['render_time_after']
+        before = totals['parse_time_before'] + totals['render_time_before']
+        totals['render_speedup'] = before / after if after > 0 else None
+        totals['page_timing'] = pages
+        return totals
+    
     # Utility Methods
     def _sort_files(self, files: List[str], order: str) -> List[str]:
         """Dosyaları sırala"""
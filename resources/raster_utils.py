@@ -0,0 +1,172 @@
+# resources/raster_utils.py
+"""
+PyPDF-Stirling Tools v2 - Raster Utilities
+PyMuPDF Pixmap, NumPy, OpenCV ve Pillow arasında ara kopyasız dönüşümler
+"""
+
+import io
+from pathlib import Path
+from typing import Dict, Optional, Tuple, Union
+
+try:
+    import numpy as np
+    from PIL import Image
+    import fitz  # PyMuPDF
+    RASTER_DEPENDENCIES_AVAILABLE = True
+except ImportError as e:
+    print(f"Raster bağımlılıkları eksik: {e}")
+    RASTER_DEPENDENCIES_AVAILABLE = False
+
+# Pixmap kanal sayısı (alfa dahil) -> Pillow modu
+_PIXMAP_MODES = {
+    (1, 0): 'L',
+    (2, 1): 'LA',
+    (3, 0): 'RGB',
+    (4, 1): 'RGBA',
+    (4, 0): 'CMYK'
+}
+
+# Pixmap.tobytes ile doğrudan kodlanabilen biçimler
+_PIXMAP_FORMATS = {'png': 'png', 'jpg': 'jpg', 'jpeg': 'jpg', 'pnm': 'pnm', 'psd': 'psd'}
+
+# Renk analizi: küçültülmüş görünümün en uzun kenarı, renkli sayılan kanal farkı ve bu farkı aşan piksel oranı
+COLOR_SAMPLE_EDGE = 512
+COLOR_SPREAD_LIMIT = 24
+COLOR_PIXEL_RATIO = 0.01
+# Siyah-beyaz kabulü: ara ton (48-207) piksellerinin en fazla oranı ve bunlardan mürekkep kenarında
+# olmayanların (fotoğraf, gölge) en fazla payı; kenar yumuşatması dışındaki ara tonlar eşiklemede kaybolur
+BITONAL_MIDTONE_RATIO = 0.06
+BITONAL_INTERIOR_RATIO = 0.15
+BITONAL_EDGE_WIDTH = 2
+
+def pixmap_to_array(pix) -> 'np.ndarray':
+    """
+    Pixmap örneklerini kopyalamadan NumPy görünümü olarak döndür: gri için (H, W), diğerleri için (H, W, N)
+    Görünüm Pixmap'in belleğini paylaşır; Pixmap nesnesi yaşadığı sürece kullanılmalıdır
+    """
+    samples = np.frombuffer(pix.samples_mv, dtype=np.uint8)
+    rows = samples.reshape(pix.height, pix.stride)[:, :pix.width * pix.n]
+    
+    if pix.n == 1:
+        return rows
+    return rows.reshape(pix.height, pix.width, pix.n)
+
+def pixmap_mode(pix) -> str:
+    """Pixmap'e karşılık gelen Pillow modu"""
+    mode = _PIXMAP_MODES.get((pix.n, pix.alpha))
+    if mode is None:
+        raise ValueError(f"Desteklenmeyen Pixmap düzeni: n={pix.n}, alpha={pix.alpha}")
+    return mode
+
+def pixmap_to_image(pix) -> 'Image.Image':
+    """Pixmap'ten Pillow görüntüsü (örnekler tek kopyayla doğrudan okunur, 'samples' ara kopyası oluşmaz)"""
+    mode = pixmap_mode(pix)
+    return Image.frombytes(mode, (pix.width, pix.height), pix.samples_mv, 'raw', mode, pix.stride)
+
+def normalize_pixmap(pix):
+    """Alfa kanalını at, CMYK / diğer renk uzaylarını RGB'ye çevir (gri ve RGB olduğu gibi döner)"""
+    if pix.alpha:
+        pix = fitz.Pixmap(pix, 0)
+    if pix.n not in (1, 3):
+        pix = fitz.Pixmap(fitz.csRGB, pix)
+    return pix
+
+def encode_pixmap(pix, format: str = 'jpeg', quality: int = 75) -> bytes:
+    """Pixmap'i Pillow'a aktarmadan doğrudan PNG/JPEG olarak kodla"""
+    output = _PIXMAP_FORMATS.get(format.lower())
+    if output is None:
+        raise ValueError(f"Desteklenmeyen biçim: {format}")
+    
+    if output == 'jpg':
+        # JPEG alfa ve CMYK taşımaz
+        pix = normalize_pixmap(pix)
+        return pix.tobytes(output, jpg_quality=quality)
+    
+    return pix.tobytes(output)
+
+def save_pixmap(pix, path: Union[str, Path], format: str = None, quality: int = 95):
+    """Pixmap'i dosyaya yaz; PyMuPDF'in desteklemediği biçimler (TIFF vb.) Pillow üzerinden"""
+    path = Path(path)
+    format = (format or path.suffix.lstrip('.')).lower()
+    
+    if format in _PIXMAP_FORMATS:
+        if _PIXMAP_FORMATS[format] == 'jpg' or pix.n - pix.alpha not in (1, 3):
+            pix = normalize_pixmap(pix)
+        pix.save(str(path), output=_PIXMAP_FORMATS[format], jpg_quality=quality)
+    else:
+        pixmap_to_image(normalize_pixmap(pix)).save(path, format.upper())
+
+def crop_pixmap(pix, width: int, height: int):
+    """Pixmap'in ortasından en fazla width x height boyutunda kesit (alfasız, gri / RGB Pixmap)"""
+    pix = normalize_pixmap(pix)
+    width, height = min(pix.width, width), min(pix.height, height)
+    if (width, height) == (pix.width, pix.height):
+        return pix
+    
+    x0, y0 = (pix.width - width) // 2, (pix.height - height) // 2
+    tile = pixmap_to_array(pix)[y0:y0 + height, x0:x0 + width]
+    return fitz.Pixmap(pix.colorspace, width, height, np.ascontiguousarray(tile).tobytes(), 0)
+
+def classify_pixels(pixels: 'np.ndarray') -> str:
+    """Küçültülmüş görünüm üzerinde renk sınıfı: 'color', 'gray' ya da 'bitonal' (gri (H, W) / RGB (H, W, 3) dizi)"""
+    step = max(1, -(-max(pixels.shape[:2]) // COLOR_SAMPLE_EDGE))
+    # Kopyasız adımlı görünüm; satırlar seyreltilir, sütunlar tam çözünürlükte kalır (harf kenarları için)
+    rows = pixels[::step]
+    
+    if rows.ndim == 3:
+        sample = rows[:, ::step]
+        spread = sample.max(axis=2).astype(np.int16) - sample.min(axis=2)
+        if np.count_nonzero(spread > COLOR_SPREAD_LIMIT) > spread.size * COLOR_PIXEL_RATIO:
+            return 'color'
+        rows = rows.mean(axis=2).astype(np.uint8)
+    
+    # İki tepeli histogram: ara tonlar az olmalı
+    histogram = np.bincount(rows.ravel(), minlength=256)
+    if histogram[48:208].sum() >= histogram.sum() * BITONAL_MIDTONE_RATIO:
+        return 'gray'
+    
+    # Kalan ara tonlar yalnızca koyu piksellerin yatay komşuluğunda olmalı (harf kenarları);
+    # küçük bir gri fotoğraf (vesikalık, logo) oran eşiğini geçse de burada yakalanır
+    midtones = (rows >= 48) & (rows < 208)
+    near_ink = rows < 48
+    for _ in range(BITONAL_EDGE_WIDTH):
+        grown = near_ink.copy()
+        grown[:, 1:] |= near_ink[:, :-1]
+        grown[:, :-1] |= near_ink[:, 1:]
+        near_ink = grown
+    
+    interior = np.count_nonzero(midtones & ~near_ink)
+    if interior > np.count_nonzero(midtones) * BITONAL_INTERIOR_RATIO:
+        return 'gray'
+    return 'bitonal'
+
+def encode_g4_tiff(mask: 'np.ndarray', dpi: Optional[int] = None) -> bytes:
+    """İki tonlu maskeyi (True = beyaz) tek şeritli CCITT G4 TIFF olarak kodla"""
+    buffer = io.BytesIO()
+    options = {'dpi': (dpi, dpi)} if dpi else {}
+    # Tek şerit: G4 verisi PDF'e olduğu gibi gömülebilir
+    Image.fromarray(mask).save(buffer, format='TIFF', compression='group4', strip_size=2**31 - 1, **options)
+    return buffer.getvalue()
+
+def ccitt_strip(tiff_data: bytes) -> Optional[Tuple[bytes, str]]:
+    """Tek şeritli G4 TIFF'ten PDF'e yeniden kodlanmadan yazılacak şerit verisi ve BlackIs1 değeri (çok şeritliyse None)"""
+    tiff = Image.open(io.BytesIO(tiff_data))
+    offsets = tiff.tag_v2.get(273)
+    byte_counts = tiff.tag_v2.get(279)
+    if not offsets or len(offsets) != 1:
+        return None
+    
+    # Siyah / beyaz anlamı TIFF fotometrik etiketinden gelir
+    black_is_1 = 'true' if tiff.tag_v2.get(262) == 1 else 'false'
+    return tiff_data[offsets[0]:offsets[0] + byte_counts[0]], black_is_1
+
+def ccitt_image_keys(width: int, height: int, black_is_1: str) -> Dict[str, str]:
+    """CCITTFaxDecode görüntü akışının sözlük anahtarları"""
+    return {
+        'Width': str(width),
+        'Height': str(height),
+        'ColorSpace': '/DeviceGray',
+        'BitsPerComponent': '1',
+        'Filter': '/CCITTFaxDecode',
+        'DecodeParms': f'<</K -1/Columns {width}/Rows {height}/BlackIs1 {black_is_1}>>'
+    }
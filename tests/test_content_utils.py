@@ -0,0 +1,186 @@
+# tests/test_content_utils.py
+"""
+İçerik akışı ayrıştırma, sadeleştirme ve küçültme testleri
+"""
+
+import pytest
+
+from resources.content_utils import (
+    minify_number, normalize_content, optimize_content, parse_content, serialize_content
+)
+
+PAGE_BOX = (0, 0, 612, 792)
+
+def normalize(data: bytes) -> bytes:
+    return normalize_content(data, PAGE_BOX)[0]
+
+def operators(data: bytes):
+    return [operator for _, operator in parse_content(data)]
+
+# Sayı küçültme
+
+@pytest.mark.parametrize('token, expected', [
+    (b'1.500', b'1.5'),
+    (b'0.25', b'.25'),
+    (b'-0.50', b'-.5'),
+    (b'10.', b'10'),
+    (b'10.0', b'10'),
+    (b'-0.0', b'0'),
+    (b'.0', b'0'),
+    (b'007', b'007'),  # Tam sayılara dokunulmaz
+    (b'12', b'12'),
+    (b'/Name', b'/Name'),
+    (b'(1.50)', b'(1.50)')
+])
+def test_minify_number(token, expected):
+    assert minify_number(token) == expected
+
+def test_numbers_minified_in_operands():
+    assert normalize(b'1.000 0.0 0.0 1.000 10.50 20.0 cm') == b'1 0 0 1 10.5 20 cm'
+
+def test_string_contents_not_minified():
+    assert normalize(b'BT (1.500 0.0) Tj ET') == b'BT(1.500 0.0)Tj\nET'
+
+# q / Q ve grafik durumu
+
+def test_identity_cm_removed():
+    assert normalize(b'1 0 0 1 0 0 cm 0 g') == b'0 g'
+
+def test_repeated_state_removed():
+    result, stats = normalize_content(b'0.5 g 0.5 g 2 w 2 w 1 w', PAGE_BOX)
+    assert result == b'.5 g\n2 w\n1 w'
+    assert stats['redundant_state'] == 2
+
+def test_empty_save_restore_removed():
+    assert normalize(b'q Q 0 g') == b'0 g'
+    assert normalize(b'q q Q Q') == b''
+
+def test_save_restore_with_only_redundant_state_removed():
+    # İç q içindeki 0 g gereksiz; kalan boş q / Q çifti de atılır
+    assert normalize(b'0 g q 0 g Q') == b'0 g'
+
+def test_state_restored_after_q():
+    # Q sonrası durum q öncesine döner; tekrar eden operatör bu durumda gereklidir
+    data = b'q 1 0 0 rg 0 0 10 10 re f Q 1 0 0 rg 0 0 10 10 re f'
+    assert operators(normalize(data)).count(b'rg') == 2
+
+def test_state_inside_q_uses_outer_state():
+    data = b'1 0 0 rg q 1 0 0 rg 0 0 10 10 re f Q'
+    assert operators(normalize(data)).count(b'rg') == 1
+
+def test_unbalanced_restore_clears_state():
+    data = b'0 g Q 0 g'
+    assert operators(normalize(data)).count(b'g') == 2
+
+def test_graphics_state_dictionary_resets_state():
+    data = b'0 g /GS1 gs 0 g'
+    assert operators(normalize(data)) == [b'g', b'gs', b'g']
+
+def test_color_space_resets_fill_only():
+    data = b'0 g 0 G /CS0 cs 0 g 0 G'
+    assert operators(normalize(data)) == [b'g', b'G', b'cs', b'g']
+
+# Metin birleştirme
+
+def test_adjacent_tj_merged():
+    result, stats = normalize_content(b'BT /F1 12 Tf (Hello) Tj ( world) Tj ET', PAGE_BOX)
+    assert result == b'BT/F1 12 Tf[(Hello)( world)]TJ\nET'
+    assert stats['merged_text'] == 1
+
+def test_tj_and_tj_array_merged():
+    data = b'BT (a) Tj [(b) -250 (c)] TJ (d) Tj ET'
+    assert normalize(data) == b'BT[(a)(b)-250(c)(d)]TJ\nET'
+
+def test_text_not_merged_across_positioning():
+    data = b'BT (a) Tj 10 0 Td (b) Tj ET'
+    assert operators(normalize(data)) == [b'BT', b'Tj', b'Td', b'Tj', b'ET']
+
+def test_text_not_merged_across_state_change():
+    data = b'BT /F1 12 Tf (a) Tj /F2 12 Tf (b) Tj ET'
+    assert operators(normalize(data)).count(b'Tj') == 2
+
+# Yollar
+
+def test_unpainted_path_removed():
+    result, stats = normalize_content(b'0 0 10 10 re n 0 0 5 5 re f', PAGE_BOX)
+    assert result == b'0 0 5 5 re\nf'
+    assert stats['invisible_paths'] == 1
+
+def test_clipping_path_kept():
+    assert normalize(b'0 0 10 10 re W n') == b'0 0 10 10 re\nW\nn'
+
+def test_offpage_path_removed():
+    result, stats = normalize_content(b'2000 2000 10 10 re f', PAGE_BOX)
+    assert result == b''
+    assert stats['offpage_paths'] == 1
+
+def test_path_moved_onto_page_by_cm_kept():
+    data = b'1 0 0 1 -2000 -2000 cm 2000 2000 10 10 re f'
+    assert operators(normalize(data)) == [b'cm', b're', b'f']
+
+def test_offpage_check_uses_restored_ctm():
+    # Q sonrası kaydırma geçerli değil; yol sayfa içinde kalır
+    data = b'q 1 0 0 1 5000 0 cm Q 0 0 10 10 re f'
+    assert operators(normalize(data))[-2:] == [b're', b'f']
+
+def test_thick_stroke_reaching_page_kept():
+    # Yol sayfanın altında ama 60 pt kalınlığındaki kontur sayfanın üst 15 pt'sini kaplar
+    data = b'60 w 0 0 1 RG 100 -15 m 400 -15 l S'
+    result, stats = normalize_content(data, PAGE_BOX)
+    assert operators(result) == [b'w', b'RG', b'm', b'l', b'S']
+    assert stats['offpage_paths'] == 0
+
+def test_stroke_width_scaled_by_ctm():
+    data = b'2 0 0 2 0 0 cm 30 w 50 -15 m 200 -15 l S'
+    assert operators(normalize(data))[-1] == b'S'
+
+def test_thin_offpage_stroke_removed():
+    result, stats = normalize_content(b'1 w 100 -2000 m 400 -2000 l S', PAGE_BOX)
+    assert operators(result) == [b'w']
+    assert stats['offpage_paths'] == 1
+
+def test_line_width_restored_after_q():
+    data = b'q 60 w Q 100 -40 m 400 -40 l S'
+    assert b'S' not in operators(normalize(data))
+
+def test_stroke_kept_when_line_width_unknown():
+    # gs sözlüğü çizgi kalınlığını değiştirebilir
+    data = b'/GS0 gs 100 -40 m 400 -40 l S'
+    assert operators(normalize(data))[-1] == b'S'
+
+def test_offpage_fill_ignores_line_width():
+    data = b'60 w 100 -40 10 10 re f'
+    assert operators(normalize(data)) == [b'w']
+
+# Satır içi görüntüler
+
+def test_inline_image_data_passed_through():
+    # Veri içindeki 'EI' ardından ayraç gelmediği için görüntünün sonu sayılmaz
+    image_data = b'\x00EI\xff\x01\x02(\x0a'
+    data = b'q BI /W 3 /H 3 /BPC 8 /CS /G ID ' + image_data + b'\nEI Q'
+    result = normalize(data)
+
+    assert b' ' + image_data + b'\nEI' in result
+    operations = parse_content(result)
+    assert [operator for _, operator in operations] == [b'q', b'BI', b'Q']
+    assert operations[1][0][-1] == image_data
+
+def test_inline_image_dictionary_minified():
+    data = b'BI /W 1 /H 1 /BPC 8 /CS /G /D [1.000 0.0] ID \x80\nEI'
+    assert normalize(data) == b'BI/W 1/H 1/BPC 8/CS/G/D[1 0]ID \x80\nEI'
+
+# Ayrıştırma / yazma
+
+def test_comments_dropped():
+    assert normalize(b'% comment\n0 g % trailing\n') == b'0 g'
+
+def test_roundtrip_preserves_operations():
+    data = (b'q 0.5 0 0 0.5 10 10 cm /Im0 Do Q BT /F1 9 Tf 1 0 0 1 72 700 Tm '
+            b'<48656c6c6f> Tj ET /P <</MCID 0>> BDC EMC')
+    operations = parse_content(data)
+    assert parse_content(serialize_content(operations)) == operations
+
+def test_optimize_content_keeps_unknown_operators():
+    operations = parse_content(b'/P <</MCID 0>> BDC 0 0 10 10 re f EMC')
+    optimized, _ = optimize_content(operations, PAGE_BOX)
+    assert [operator for _, operator in optimized] == [b'BDC', b're', b'f', b'EMC']